@@ -5,13 +5,103 @@ Provides a configurable, extensible mapping system to control which fields
 are extracted from SARIF and how they map to the Wiz output schema.
 """
 
+import functools
 import json
+import re
+from dataclasses import dataclass
+from itertools import chain
 from pathlib import Path
-from typing import Any, Dict, List, Optional, Callable
+from typing import Any, Dict, Iterator, List, Optional, Callable, Tuple
 import logging
 
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
 logger = logging.getLogger(__name__)
 
+# Path tokens: a bare key ("message") or a bracketed array index ("[0]")
+_PATH_TOKEN = re.compile(r'([^.\[\]]+)|\[(-?\d+)\]')
+
+# Sections whose output is restricted to a single top-level Wiz field; other
+# fields they map are not part of the finding schema and are dropped
+_SECTION_SCOPES = {"target_component": "targetComponent"}
+
+# Informational keys inside sarif_to_wiz_mappings that are not mapping sections
+_NON_MAPPING_SECTIONS = frozenset(("description", "version"))
+
+
+@functools.lru_cache(maxsize=512)
+def _parse_path(path: str) -> Tuple[Any, ...]:
+    """
+    Parse a path string into components.
+    
+    Results are memoized, so repeated lookups of the same path are free.
+    
+    Examples:
+        "ruleId" -> ("ruleId",)
+        "message.text" -> ("message", "text")
+        "locations[0].physicalLocation" -> ("locations", 0, "physicalLocation")
+    """
+    return tuple(
+        int(match.group(2)) if match.group(2) is not None else match.group(1)
+        for match in _PATH_TOKEN.finditer(path)
+    )
+
+
+def _codegen_lookup(parts: Tuple[Any, ...], indent: str) -> List[str]:
+    """
+    Generate statements assigning r[part][part]... to v, raising on a miss.
+    
+    Integer parts only index lists (and tuples): a string at that position
+    is a miss rather than a source of single characters.
+    """
+    lines = []
+    expr = "r"
+    for part in parts:
+        if isinstance(part, int):
+            lines += [
+                f"{indent}v = {expr}",
+                f"{indent}if not isinstance(v, (list, tuple)): raise TypeError",
+            ]
+            expr = "v"
+        expr += f"[{part!r}]"
+    lines.append(f"{indent}v = {expr}")
+    return lines
+
+
+def _compile_function(
+    source: str, name: str, filename: str, namespace: Optional[Dict[str, Any]] = None
+) -> Callable:
+    """Compile generated Python source and return the function it defines."""
+    namespace = dict(namespace or {})
+    exec(compile(source, filename, "exec"), namespace)
+    return namespace[name]
+
+
+@dataclass
+class CompiledMapping:
+    """A mapping configuration resolved into callables at config load."""
+
+    __slots__ = (
+        "wiz_field", "source", "sarif_path", "default",
+        "extract", "transform", "transform_config", "setter", "apply"
+    )
+
+    wiz_field: Optional[str]
+    source: Optional[str]
+    sarif_path: Optional[str]
+    default: Any
+    extract: Optional[Callable[[Dict[str, Any]], Any]]
+    transform: Optional[Callable[[Any, Dict[str, Any]], Any]]
+    transform_config: Dict[str, Any]
+    setter: Optional[Callable[[Dict[str, Any], Any], None]]
+    # apply(result, finding) writes straight into the finding's nested objects
+    # and raises KeyError if they are missing: pass a finding created by
+    # MappingEngine._new_finding(), or use extract/transform/setter instead
+    apply: Optional[Callable[[Dict[str, Any], Dict[str, Any]], None]]
+
 
 class MappingEngine:
     """Handles field mapping from SARIF to Wiz format based on configuration."""
@@ -25,13 +115,25 @@ class MappingEngine:
         """
         self.config = self._load_config(config_path)
         self.transformations = self._compile_transformations()
+        self._compile_mappings()
+        self._enabled_sections: Tuple[str, ...] = tuple(
+            name for name, section_config in self.config.get("sarif_to_wiz_mappings", {}).items()
+            if name not in _NON_MAPPING_SECTIONS and section_config.get("enabled", True)
+        )
+        self._mappings_cache: Dict[str, Tuple[Dict[str, Any], ...]] = {}
+        self._compiled_cache: Dict[str, Tuple[CompiledMapping, ...]] = {}
+        self._all_enabled_cache: Optional[Dict[str, Tuple[Dict[str, Any], ...]]] = None
+        self._summary_fragments: Dict[str, List[str]] = {}
+        self._compile_pipeline()
 
     @staticmethod
     def _load_config(config_path: Path) -> Dict[str, Any]:
         """Load the mapping configuration from JSON file."""
         try:
-            with open(config_path, 'r') as f:
-                return json.load(f)
+            with open(config_path, 'rb') as f:
+                data = f.read()
+            # orjson is an optional, faster drop-in for the stdlib parser
+            return orjson.loads(data) if orjson else json.loads(data)
         except FileNotFoundError:
             logger.error(f"Mapping configuration not found: {config_path}")
             raise
@@ -41,17 +143,223 @@ class MappingEngine:
 
     def _compile_transformations(self) -> Dict[str, Callable]:
         """Compile transformation functions from config."""
+        self._transform_configs: Dict[str, Dict[str, Any]] = self.config.get("transformations", {})
+        severity_mappings = self._transform_configs.get("map_severity", {}).get("mappings", {})
+        self._severity_lower = {k.lower(): v for k, v in severity_mappings.items()}
         return {
             "map_severity": self._transform_map_severity,
             "clean_fixed_version": self._transform_clean_fixed_version,
             "format_remediation": self._transform_format_remediation
         }
 
+    def _compile_mappings(self) -> None:
+        """
+        Compile every mapping in the configuration.
+
+        Each mapping dict gets its CompiledMapping cached under ``_compiled``,
+        so apply_mapping() and build_finding() never re-parse paths or look up
+        transforms per SARIF result.
+        """
+        for section_name, section_config in self.config.get("sarif_to_wiz_mappings", {}).items():
+            if not isinstance(section_config, dict):
+                continue
+            for mapping in section_config.get("mappings", []):
+                mapping["_compiled"] = self._compile_mapping(mapping)
+
+    def _compile_mapping(self, mapping: Dict[str, Any]) -> CompiledMapping:
+        """Resolve a single mapping's extractor, transform and setter."""
+        wiz_field = mapping.get("wiz_field")
+        source = mapping.get("source")
+        sarif_path = mapping.get("sarif_path")
+
+        extract = None
+        transform, transform_config = None, {}
+        default = None
+        apply = None
+        if source == "constant":
+            constant = mapping.get("value")
+            extract = lambda _, v=constant: v
+            if wiz_field:
+                apply = self._codegen_applier(wiz_field, constant=constant)
+        elif source == "sarif_result" and sarif_path:
+            parts = _parse_path(sarif_path)
+            extract = self._codegen_extractor(parts)
+            transform, transform_config = self._resolve_transform(mapping.get("transform"))
+            default = mapping.get("default")
+            if wiz_field:
+                apply = self._codegen_applier(
+                    wiz_field, parts=parts, default=default,
+                    transform=transform, transform_config=transform_config
+                )
+
+        return CompiledMapping(
+            wiz_field=wiz_field,
+            source=source,
+            sarif_path=sarif_path,
+            default=default,
+            extract=extract,
+            transform=transform,
+            transform_config=transform_config,
+            setter=self._codegen_setter(wiz_field) if wiz_field else None,
+            apply=apply
+        )
+
+    def _resolve_transform(self, transform_name: Optional[str]) -> Tuple[Optional[Callable], Dict[str, Any]]:
+        """Look up the transform callable and its configuration by name."""
+        if not transform_name:
+            return None, {}
+        return (
+            self.transformations.get(transform_name),
+            self._transform_configs.get(transform_name, {})
+        )
+
+    def _compile_pipeline(self) -> None:
+        """
+        Flatten all enabled mappings, in section order, for build_finding().
+        
+        Also generates the finding skeleton (every intermediate object the
+        mapped fields need, preallocated as a nested dict literal) and the
+        matching prune step that drops branches left empty.
+        
+        Mappings that cannot be applied generically (e.g. metadata entries
+        without a sarif_path) are left to the caller.
+        """
+        pipeline = []
+        for section_name in self._enabled_sections:
+            scope = _SECTION_SCOPES.get(section_name)
+            for compiled in self._get_compiled_mappings(section_name):
+                if compiled.apply is None:
+                    continue
+                wiz_field = compiled.wiz_field
+                if scope and wiz_field != scope and not wiz_field.startswith(scope + "."):
+                    continue
+                pipeline.append(compiled)
+
+        self._compiled_pipeline = [compiled.apply for compiled in pipeline]
+
+        skeleton: Dict[str, Any] = {}
+        for compiled in pipeline:
+            branch = skeleton
+            for part in compiled.wiz_field.split(".")[:-1]:
+                branch = branch.setdefault(part, {})
+
+        self._new_finding = _compile_function(
+            f"def _new():\n    return {skeleton!r}\n", "_new", "<finding skeleton>"
+        )
+        self._prune_finding = self._codegen_pruner(skeleton)
+
+    @staticmethod
+    def _codegen_pruner(skeleton: Dict[str, Any]) -> Callable[[Dict[str, Any]], None]:
+        """
+        Generate a function removing skeleton branches that received no values.
+        
+        Top-level branches are popped and re-inserted when non-empty, so they
+        follow the scalar fields in key order, as when created on demand.
+        """
+        lines = ["def _prune(o):", "    pass"]
+
+        def prune_children(expr: str, branch: Dict[str, Any]) -> None:
+            for key, children in branch.items():
+                child = f"{expr}[{key!r}]"
+                prune_children(child, children)
+                lines.append(f"    if not {child}: del {child}")
+
+        for key, children in skeleton.items():
+            lines.append(f"    b = o.pop({key!r})")
+            prune_children("b", children)
+            lines.append(f"    if b: o[{key!r}] = b")
+        return _compile_function("\n".join(lines) + "\n", "_prune", "<finding pruner>")
+
+    @staticmethod
+    def _codegen_extractor(parts: Tuple[Any, ...]) -> Callable[[Dict[str, Any]], Any]:
+        """
+        Generate an extractor function specialized to a fixed path.
+        
+        Example:
+            ("locations", 0, "physicalLocation") compiles to
+            lambda r: r["locations"][0]["physicalLocation"] (None on any miss,
+            including "locations" not being a list)
+        """
+        subscripts = "".join(f"[{part!r}]" for part in parts)
+        lines = ["def _extract(r):", "    try:"]
+        lines += _codegen_lookup(parts, "        ")
+        lines += [
+            "    except (KeyError, IndexError, TypeError):",
+            "        return None",
+            "    return v",
+        ]
+        return _compile_function("\n".join(lines) + "\n", "_extract", f"<extract {subscripts}>")
+
+    @staticmethod
+    def _codegen_setter(wiz_field: str) -> Callable[[Dict[str, Any], Any], None]:
+        """
+        Generate a setter function specialized to a fixed dot-notation field.
+        
+        Missing intermediate objects are created, as in set_nested_field().
+        
+        Example:
+            "targetComponent.library.filePath" compiles to
+            o.setdefault("targetComponent", {}).setdefault("library", {})["filePath"] = v
+        """
+        *parents, leaf = wiz_field.split(".")
+        target = "o" + "".join(f".setdefault({part!r}, {{}})" for part in parents) + f"[{leaf!r}]"
+        source = (
+            "def _set(o, v):\n"
+            f"    {target} = v\n"
+        )
+        return _compile_function(source, "_set", f"<set {wiz_field}>")
+
     @staticmethod
-    def _transform_map_severity(value: str, transform_config: Dict) -> str:
+    def _codegen_applier(
+        wiz_field: str,
+        parts: Optional[Tuple[Any, ...]] = None,
+        constant: Any = None,
+        default: Any = None,
+        transform: Optional[Callable] = None,
+        transform_config: Optional[Dict[str, Any]] = None
+    ) -> Callable[[Dict[str, Any], Dict[str, Any]], None]:
+        """
+        Generate one function that extracts, defaults, transforms and sets a field.
+        
+        Fuses the extractor and setter (plus default substitution and the
+        transform call, when configured) so build_finding() makes a single
+        call per mapping. Without ``parts`` the mapping is a constant.
+        
+        The generated assignment does not create intermediate objects; the
+        target finding must come from the finding skeleton (_new_finding).
+        """
+        lines = ["def _apply(r, o):"]
+        if parts is None:
+            lines.append("    v = constant")
+        else:
+            lines.append("    try:")
+            lines += _codegen_lookup(parts, "        ")
+            lines += [
+                "    except (KeyError, IndexError, TypeError):",
+                "        v = None",
+            ]
+            if default is not None:
+                lines += ["    if v is None:", "        v = default"]
+            if transform is not None:
+                lines += ["    if v is not None:", "        v = transform(v, transform_config)"]
+        target = "o" + "".join(f"[{part!r}]" for part in wiz_field.split("."))
+        lines += ["    if v is not None:", f"        {target} = v"]
+
+        namespace = {
+            "constant": constant,
+            "default": default,
+            "transform": transform,
+            "transform_config": transform_config
+        }
+        return _compile_function("\n".join(lines) + "\n", "_apply", f"<apply {wiz_field}>", namespace)
+
+    def _transform_map_severity(self, value: str, transform_config: Dict) -> str:
         """Map SARIF severity level to Wiz severity."""
-        mapping = transform_config.get("mappings", {})
-        return mapping.get(value.lower(), "Medium")
+        # SARIF levels are lowercase per spec, so only fold case on a miss
+        severity = self._severity_lower.get(value)
+        if severity is None:
+            severity = self._severity_lower.get(value.lower(), "Medium")
+        return severity
 
     @staticmethod
     def _transform_clean_fixed_version(value: str, transform_config: Dict) -> str:
@@ -70,30 +378,64 @@ class MappingEngine:
         template = transform_config.get("template", "Update to version: {value}")
         return template.format(value=value)
 
-    def get_field_mappings(self, section: str = "finding_level") -> List[Dict[str, Any]]:
+    def get_field_mappings(self, section: str = "finding_level") -> Tuple[Dict[str, Any], ...]:
         """
         Get enabled field mappings for a section.
         
+        Results are cached per section until enable_mapping() changes them.
+        
         Args:
             section: Mapping section name (finding_level, target_component, etc.)
             
         Returns:
-            List of enabled mapping configurations
+            Tuple of enabled mapping configurations
         """
-        section_config = self.config.get("sarif_to_wiz_mappings", {}).get(section, {})
-        mappings = section_config.get("mappings", [])
-        return [m for m in mappings if m.get("enabled", True)]
-
-    def get_all_enabled_mappings(self) -> Dict[str, List[Dict[str, Any]]]:
+        cached = self._mappings_cache.get(section)
+        if cached is None:
+            section_config = self.config.get("sarif_to_wiz_mappings", {}).get(section, {})
+            mappings = section_config.get("mappings", [])
+            cached = tuple(m for m in mappings if m.get("enabled", True))
+            self._mappings_cache[section] = cached
+        return cached
+
+    def get_all_enabled_mappings(self) -> Dict[str, Tuple[Dict[str, Any], ...]]:
         """Get all enabled mappings from all sections."""
-        result = {}
-        for section_name, section_config in self.config.get("sarif_to_wiz_mappings", {}).items():
-            if section_name in ["description", "version"]:
-                continue
-            if section_config.get("enabled", True):
-                result[section_name] = self.get_field_mappings(section_name)
+        if self._all_enabled_cache is not None:
+            return self._all_enabled_cache
+        result = {name: self.get_field_mappings(name) for name in self._enabled_sections}
+        self._all_enabled_cache = result
         return result
 
+    def _get_compiled_mappings(self, section: str) -> Tuple[CompiledMapping, ...]:
+        """Get the compiled form of a section's enabled mappings (cached like get_field_mappings)."""
+        cached = self._compiled_cache.get(section)
+        if cached is None:
+            cached = tuple(mapping["_compiled"] for mapping in self.get_field_mappings(section))
+            self._compiled_cache[section] = cached
+        return cached
+
+    def iter_all_enabled(self) -> Iterator[CompiledMapping]:
+        """Iterate the compiled mappings of all enabled sections without building lists."""
+        return chain.from_iterable(
+            self._get_compiled_mappings(name) for name in self._enabled_sections
+        )
+
+    def build_finding(self, sarif_result: Dict[str, Any]) -> Dict[str, Any]:
+        """
+        Build a Wiz finding from a SARIF result using all enabled mappings.
+        
+        Args:
+            sarif_result: SARIF result object
+            
+        Returns:
+            Finding dict containing every mapped field with a non-None value
+        """
+        finding = self._new_finding()
+        for apply in self._compiled_pipeline:
+            apply(sarif_result, finding)
+        self._prune_finding(finding)
+        return finding
+
     def extract_value(self, obj: Dict[str, Any], path: str) -> Any:
         """
         Extract value from nested object using dot notation and array indices.
@@ -110,61 +452,32 @@ class MappingEngine:
         Returns:
             Extracted value or None if not found
         """
-        parts = self._parse_path(path)
-        current = obj
-
-        for part in parts:
-            if current is None:
-                return None
-
-            if isinstance(part, int):
-                # Array index
-                if isinstance(current, list) and -len(current) <= part < len(current):
-                    current = current[part]
-                else:
-                    return None
-            else:
-                # Object key
-                if isinstance(current, dict):
-                    current = current.get(part)
-                else:
-                    return None
-
-        return current
+        return self.extract_value_compiled(obj, _parse_path(path))
 
     @staticmethod
-    def _parse_path(path: str) -> List[Any]:
+    def extract_value_compiled(obj: Dict[str, Any], parts: Tuple[Any, ...]) -> Any:
         """
-        Parse a path string into components.
+        Extract value from nested object using pre-parsed path components.
         
-        Examples:
-            "ruleId" -> ["ruleId"]
-            "message.text" -> ["message", "text"]
-            "locations[0].physicalLocation" -> ["locations", 0, "physicalLocation"]
+        Args:
+            obj: Object to extract from
+            parts: Path components as returned by _parse_path
+            
+        Returns:
+            Extracted value or None if not found
         """
-        parts = []
-        current = ""
-
-        for char in path:
-            if char == ".":
-                if current:
-                    parts.append(current)
-                    current = ""
-            elif char == "[":
-                if current:
-                    parts.append(current)
-                    current = ""
-            elif char == "]":
-                if current.isdigit():
-                    parts.append(int(current))
-                    current = ""
-            else:
-                current += char
-
-        if current:
-            parts.append(current)
-
-        return parts
+        # Subscripting works the same for dict keys and list indices; misses
+        # are rare, so handle them as exceptions rather than guarding each step.
+        # Integer parts only index lists, never strings.
+        current = obj
+        try:
+            for part in parts:
+                if part.__class__ is int and not isinstance(current, (list, tuple)):
+                    return None
+                current = current[part]
+        except (KeyError, IndexError, TypeError):
+            return None
+        return current
 
     def apply_mapping(
         self,
@@ -183,34 +496,23 @@ class MappingEngine:
         Returns:
             Tuple of (wiz_field_path, extracted_value)
         """
-        wiz_field = mapping_config.get("wiz_field")
-        source = mapping_config.get("source")
-
-        # Handle constant values
-        if source == "constant":
-            value = mapping_config.get("value")
-            return wiz_field, value
-
-        # Handle SARIF result extraction
-        if source == "sarif_result":
-            sarif_path = mapping_config.get("sarif_path")
-            value = self.extract_value(sarif_result, sarif_path)
+        compiled = mapping_config.get("_compiled")
+        if compiled is None:
+            compiled = self._compile_mapping(mapping_config)
 
-            if value is None:
-                default = mapping_config.get("default")
-                value = default if default is not None else None
+        # Unsupported sources (or a sarif_result without a path) map to nothing
+        if compiled.extract is None:
+            return compiled.wiz_field, None
 
-            # Apply transformation if specified
-            transform_name = mapping_config.get("transform")
-            if transform_name and value is not None:
-                transform_func = self.transformations.get(transform_name)
-                if transform_func:
-                    transform_config = self.config.get("transformations", {}).get(transform_name, {})
-                    value = transform_func(value, transform_config)
+        value = compiled.extract(sarif_result)
+        if value is None:
+            value = compiled.default
 
-            return wiz_field, value
+        # Apply transformation if specified
+        if compiled.transform and value is not None:
+            value = compiled.transform(value, compiled.transform_config)
 
-        return wiz_field, None
+        return compiled.wiz_field, value
 
     def set_nested_field(self, obj: Dict[str, Any], path: str, value: Any) -> None:
         """
@@ -250,24 +552,35 @@ class MappingEngine:
         for mapping in mappings:
             if mapping.get("wiz_field") == field_name:
                 mapping["enabled"] = enabled
+                self._mappings_cache.pop(section, None)
+                self._compiled_cache.pop(section, None)
+                self._all_enabled_cache = None
+                self._summary_fragments.pop(section, None)
+                self._compile_pipeline()
                 logger.info(f"Field {field_name} in {section} set to {enabled}")
                 break
 
     def get_mapping_summary(self) -> str:
         """Get a human-readable summary of all enabled mappings."""
-        summary = []
-        all_mappings = self.get_all_enabled_mappings()
-
-        for section, mappings in all_mappings.items():
-            summary.append(f"\n[{section}]")
-            for mapping in mappings:
+        return "\n".join(
+            fragment
+            for section in self.get_all_enabled_mappings()
+            for fragment in self._get_summary_fragments(section)
+        )
+
+    def _get_summary_fragments(self, section: str) -> List[str]:
+        """Get the cached summary lines for one section, formatting them on first use."""
+        fragments = self._summary_fragments.get(section)
+        if fragments is None:
+            fragments = [f"\n[{section}]"]
+            for mapping in self.get_field_mappings(section):
                 wiz_field = mapping.get("wiz_field", "unknown")
                 sarif_path = mapping.get("sarif_path", "N/A")
                 source = mapping.get("source", "unknown")
                 desc = mapping.get("description", "")
-                summary.append(f"  {wiz_field}")
-                summary.append(f"    ← {source}: {sarif_path}")
+                fragment = f"  {wiz_field}\n    ← {source}: {sarif_path}"
                 if desc:
-                    summary.append(f"    # {desc}")
-
-        return "\n".join(summary)
+                    fragment += f"\n    # {desc}"
+                fragments.append(fragment)
+            self._summary_fragments[section] = fragments
+        return fragments
@@ -8,21 +8,35 @@ It validates input against sarif-schema.json and output against wiz-vuln-schema.
 Usage:
     python sarif_to_wiz_converter.py --input <sarif_file> --output <wiz_file> [--integration-id <id>]
     python sarif_to_wiz_converter.py --input-dir <dir> --output-dir <dir> [--integration-id <id>]
+    python sarif_to_wiz_converter.py --keep-alive --output-dir <dir> < paths.txt
 """
 
 import argparse
 import json
 import logging
+import os
 import re
 import sys
+import traceback
+from concurrent.futures import ProcessPoolExecutor
 from datetime import datetime, timezone
 from pathlib import Path
-from typing import Any, Dict, List, Optional
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Tuple
 from uuid import uuid4
 
-import jsonschema
-from jsonschema import Draft4Validator, ValidationError
+from jsonschema import ValidationError
 from mapping_engine import MappingEngine
+from schema_validation import SchemaValidator, get_validator
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+try:
+    import ijson
+except ImportError:
+    ijson = None
 
 
 # Configure logging
@@ -32,65 +46,58 @@ logging.basicConfig(
 )
 logger = logging.getLogger(__name__)
 
+# Hardcoded, likely need to update this to tenant specific if needed
+WIZ_INTEGRATION_ID = "55c176cc-d155-43a2-98ed-aa56873a1ca1"
 
-class SchemaValidator:
-    """Validates JSON documents against JSON schemas."""
+# SARIF result level -> Wiz severity
+_SARIF_TO_WIZ_SEVERITY = {
+    "none": "None",
+    "note": "Low",
+    "warning": "Medium",
+    "error": "High"
+}
 
-    def __init__(self, schema_path: Path):
-        """Initialize validator with a schema file."""
-        self.schema_path = schema_path
-        self.schema = self._load_schema(schema_path)
-        self.validator = Draft4Validator(self.schema)
+# File suffixes picked up by --input-dir
+_SARIF_SUFFIXES = (".sarif", ".json")
 
-    @staticmethod
-    def _load_schema(schema_path: Path) -> Dict[str, Any]:
-        """Load JSON schema from file."""
-        try:
-            with open(schema_path, 'r') as f:
-                return json.load(f)
-        except FileNotFoundError:
-            logger.error(f"Schema file not found: {schema_path}")
-            raise
-        except json.JSONDecodeError as e:
-            logger.error(f"Invalid JSON in schema file {schema_path}: {e}")
-            raise
-
-    def validate(self, document: Dict[str, Any], name: str = "document") -> bool:
-        """
-        Validate document against schema.
-        
-        Args:
-            document: Document to validate
-            name: Name for logging purposes
-            
-        Returns:
-            True if valid, raises ValidationError if not
-        """
-        try:
-            self.validator.validate(document)
-            logger.info(f"✓ {name} validation passed")
-            return True
-        except ValidationError as e:
-            logger.error(f"✗ {name} validation failed: {e.message}")
-            logger.error(f"  Path: {list(e.path)}")
-            raise
+# Input bytes each worker process must have to convert before --input-dir
+# uses a pool by default. Conversion runs at roughly 5 MB/s, so this is
+# about the cost of starting a worker and building its processor.
+_MIN_BYTES_PER_WORKER = 2 * 1024 * 1024
+
+# Parse errors raised while reading SARIF input
+_JSON_ERRORS = (json.JSONDecodeError,) + ((ijson.JSONError,) if ijson else ())
 
 
 class SARIFtoWizConverter:
     """Converts SARIF findings to Wiz vulnerability ingestion format."""
 
+    __slots__ = (
+        "sarif_validator", "wiz_validator", "integration_id",
+        "repository_name", "repository_url", "branch_name",
+        "mapping_engine", "cve_only", "validate_output", "cve_pattern",
+        "_build_asset", "_repo_fields"
+    )
+
     def __init__(
         self,
         sarif_schema: SchemaValidator,
-        wiz_schema: SchemaValidator,
+        wiz_schema: Optional[SchemaValidator],
         integration_id: str = "sarif-integration",
         repository_name: Optional[str] = None,
         repository_url: Optional[str] = None,
         branch_name: Optional[str] = None,
         mapping_engine: Optional[MappingEngine] = None,
-        cve_only: bool = False
+        cve_only: bool = False,
+        validate_output: bool = False
     ):
-        """Initialize converter with schema validators and optional mapping engine."""
+        """
+        Initialize converter with schema validators and optional mapping engine.
+        
+        Output validation against the Wiz schema is opt-in (validate_output):
+        the converter's own output is trusted in production runs, and
+        wiz_schema may be None unless validate_output is set.
+        """
         self.sarif_validator = sarif_schema
         self.wiz_validator = wiz_schema
         self.integration_id = integration_id
@@ -99,8 +106,25 @@ class SARIFtoWizConverter:
         self.branch_name = branch_name
         self.mapping_engine = mapping_engine
         self.cve_only = cve_only
+        self.validate_output = validate_output
         self.cve_pattern = re.compile(r'CVE-\d{4}-\d{4,}', re.IGNORECASE)
 
+        # The asset type is fixed for the converter's lifetime; pick the builder once
+        if repository_name and repository_url:
+            self._build_asset = self._build_repo_asset
+            # Constant part of every repositoryBranch asset, shared by all of them
+            self._repo_fields = {
+                "branchName": branch_name or "main",
+                "repository": {
+                    "name": repository_name,
+                    "url": repository_url
+                },
+                "vcs": "GitHub"
+            }
+        else:
+            self._build_asset = self._build_vm_asset
+            self._repo_fields = None
+
     def convert(self, sarif_doc: Dict[str, Any]) -> Dict[str, Any]:
         """
         Convert SARIF document to Wiz vulnerability schema.
@@ -115,7 +139,7 @@ class SARIFtoWizConverter:
         self.sarif_validator.validate(sarif_doc, "SARIF input")
 
         wiz_doc = {
-            "integrationId": "55c176cc-d155-43a2-98ed-aa56873a1ca1", #hardcoded, likely need to update this to tenant specific if needed
+            "integrationId": WIZ_INTEGRATION_ID,
             "dataSources": []
         }
 
@@ -125,11 +149,61 @@ class SARIFtoWizConverter:
             if data_source:
                 wiz_doc["dataSources"].append(data_source)
 
-        # Validate output
-        self.wiz_validator.validate(wiz_doc, "Wiz output")
+        # Validate output (debug/CI only)
+        if self.validate_output:
+            self.wiz_validator.validate(wiz_doc, "Wiz output")
 
         return wiz_doc
 
+    def convert_streaming(self, input_path: Path, output_path: Path) -> int:
+        """
+        Convert a SARIF file to a Wiz file without loading the whole document.
+        
+        Results are parsed one at a time with ijson and each data source is
+        written as soon as its run ends, so peak memory is bounded by the
+        converted findings of one run rather than the size of the SARIF file.
+        Schema validation needs the full document and is skipped; the output
+        is written as compact JSON.
+        
+        Args:
+            input_path: Path to SARIF file
+            output_path: Path to write Wiz file
+            
+        Returns:
+            Number of data sources written
+        """
+        dumps = orjson.dumps if orjson else lambda obj: json.dumps(obj).encode()
+        header = dumps({"integrationId": WIZ_INTEGRATION_ID})[:-1]
+        written = 0
+
+        with open(input_path, 'rb') as src, open(output_path, 'wb') as out:
+            try:
+                out.write(header + b',"dataSources":[')
+                for run_idx, (run_info, results) in enumerate(_stream_sarif_runs(src)):
+                    now_iso = datetime.now(timezone.utc).strftime("%Y-%m-%dT%H:%M:%S.%fZ")
+                    assets = self._group_results(results, now_iso)
+                    if not run_info["result_count"]:
+                        logger.debug(f"Run {run_idx} has no results")
+                        continue
+
+                    data_source = {
+                        "id": self._data_source_id(run_info["tool_name"], run_idx),
+                        "analysisDate": now_iso,
+                        "assets": assets
+                    }
+                    if written:
+                        out.write(b",")
+                    out.write(dumps(data_source))
+                    written += 1
+                out.write(b"]}")
+            except BaseException:
+                # Don't leave a truncated Wiz file behind
+                out.close()
+                output_path.unlink()
+                raise
+
+        return written
+
     def _convert_run(self, run: Dict[str, Any], run_idx: int) -> Optional[Dict[str, Any]]:
         """
         Convert a SARIF run to a Wiz data source.
@@ -148,22 +222,36 @@ class SARIFtoWizConverter:
 
         tool_name = run.get("tool", {}).get("driver", {}).get("name", "unknown-tool")
 
-        # Generate data source ID based on repository and branch name if available, otherwise use tool name
-        if self.repository_name:
-            if self.branch_name:
-                data_source_id = f"{self.repository_name}/{self.branch_name}"
-            else:
-                data_source_id = f"{self.repository_name}/main"
-        else:
-            data_source_id = f"{tool_name}-run-{run_idx}"
+        # One timestamp per run, shared by the data source and every asset
+        now_iso = datetime.now(timezone.utc).strftime("%Y-%m-%dT%H:%M:%S.%fZ")
 
-        data_source = {
-            "id": data_source_id,
-            "analysisDate": datetime.now(timezone.utc).isoformat().replace("+00:00", "Z"),
-            "assets": []
+        return {
+            "id": self._data_source_id(tool_name, run_idx),
+            "analysisDate": now_iso,
+            "assets": self._group_results(results, now_iso)
         }
 
-        # Group results by asset (file/URI)
+    def _data_source_id(self, tool_name: str, run_idx: int) -> str:
+        """Data source ID from repository and branch name if available, otherwise tool name."""
+        if self.repository_name:
+            if self.branch_name:
+                return f"{self.repository_name}/{self.branch_name}"
+            return f"{self.repository_name}/main"
+        return f"{tool_name}-run-{run_idx}"
+
+    def _group_results(
+        self, results: Iterable[Dict[str, Any]], now_iso: str
+    ) -> List[Dict[str, Any]]:
+        """
+        Convert SARIF results and group the findings into Wiz assets by URI.
+        
+        Args:
+            results: SARIF result objects of one run (a list or a lazy stream)
+            now_iso: ISO-8601 UTC timestamp for the current run
+            
+        Returns:
+            Wiz assets in order of first appearance
+        """
         assets_map: Dict[str, Dict[str, Any]] = {}
         filtered_count = 0
 
@@ -174,27 +262,27 @@ class SARIFtoWizConverter:
                 continue
             
             asset_id, asset_details, finding = self._convert_result(
-                result, result_idx, tool_name
+                result, result_idx, now_iso
             )
 
-            if asset_id not in assets_map:
-                assets_map[asset_id] = {
-                    "analysisDate": datetime.now(timezone.utc).isoformat().replace("+00:00", "Z"),
+            entry = assets_map.get(asset_id)
+            if entry is None:
+                entry = assets_map[asset_id] = {
+                    "analysisDate": now_iso,
                     "details": asset_details,
                     "vulnerabilityFindings": []
                 }
 
-            assets_map[asset_id]["vulnerabilityFindings"].append(finding)
+            entry["vulnerabilityFindings"].append(finding)
         
         # Log filtered findings
         if self.cve_only and filtered_count > 0:
             logger.info(f"CVE-only filter: Excluded {filtered_count} non-CVE findings")
 
-        data_source["assets"] = list(assets_map.values())
-        return data_source
+        return list(assets_map.values())
 
     def _convert_result(
-        self, result: Dict[str, Any], result_idx: int, tool_name: str
+        self, result: Dict[str, Any], result_idx: int, now_iso: str
     ) -> tuple[str, Dict[str, Any], Dict[str, Any]]:
         """
         Convert a SARIF result to a Wiz asset and vulnerability finding.
@@ -202,75 +290,71 @@ class SARIFtoWizConverter:
         Args:
             result: SARIF result object
             result_idx: Index of the result
-            tool_name: Name of the analysis tool
+            now_iso: ISO-8601 UTC timestamp for the current run
             
         Returns:
             Tuple of (asset_id, asset_details, vulnerability_finding)
         """
-        # Extract asset information from locations
-        locations = result.get("locations", [])
-        physical_location = None
-        
-        if locations:
-            physical_location = locations[0].get("physicalLocation", {})
+        # Walk the first location once; asset and finding both need its URI
+        uri, physical_location = self._first_location_uri(result)
 
-        # Generate asset based on available location info
-        asset_id, asset_details = self._extract_asset_details(
-            physical_location, tool_name, result_idx
-        )
+        # Use URI as asset ID (unique per file)
+        asset_id = uri if uri is not None else f"unknown-{result_idx}"
+        asset_details = self._build_asset(asset_id, now_iso)
 
         # Extract vulnerability finding information
-        finding = self._extract_vulnerability_finding(result, result_idx)
+        finding = self._extract_vulnerability_finding(result, result_idx, uri)
 
         return asset_id, asset_details, finding
 
-    def _extract_asset_details(
-        self, physical_location: Dict[str, Any], tool_name: str, result_idx: int
-    ) -> tuple[str, Dict[str, Any]]:
+    @staticmethod
+    def _first_location_uri(
+        result: Dict[str, Any]
+    ) -> Tuple[Optional[str], Dict[str, Any]]:
         """
-        Extract asset details from SARIF location.
+        Return the artifact URI and physicalLocation of a result's first location.
         
         Returns:
-            Tuple of (asset_id, asset_details)
+            Tuple of (uri or None, physical_location or empty dict)
         """
-        # Extract artifact information
-        artifact_location = physical_location.get("artifactLocation", {})
-        uri = artifact_location.get("uri", f"unknown-{result_idx}")
-
-        # Use URI as asset ID (unique per file)
-        asset_id = uri
-
-        # If repository name and URL are provided, use repositoryBranch asset type
-        if self.repository_name and self.repository_url:
-            asset_details = {
-                "repositoryBranch": {
-                    "assetId": asset_id,
-                    "assetName": uri,
-                    "branchName": self.branch_name or "main",
-                    "repository": {
-                        "name": self.repository_name,
-                        "url": self.repository_url
-                    },
-                    "vcs": "GitHub",
-                    "firstSeen": datetime.now(timezone.utc).isoformat().replace("+00:00", "Z")
-                }
-            }
-        else:
-            # Create virtualMachine as the asset type - most flexible and general-purpose
-            # Works for any type of finding source (files, packages, services, etc.)
-            asset_details = {
-                "virtualMachine": {
-                    "assetId": asset_id,
-                    "name": uri,
-                    "hostname": uri,
-                    "firstSeen": datetime.now(timezone.utc).isoformat().replace("+00:00", "Z")
-                }
+        locations = result.get("locations")
+        if locations:
+            physical_location = locations[0].get("physicalLocation")
+            if physical_location:
+                artifact_location = physical_location.get("artifactLocation")
+                uri = artifact_location.get("uri") if artifact_location else None
+                return uri, physical_location
+        return None, {}
+
+    def _build_repo_asset(self, uri: str, now_iso: str) -> Dict[str, Any]:
+        """Build repositoryBranch asset details (repository name and URL provided)."""
+        return {
+            "repositoryBranch": {
+                "assetId": uri,
+                "assetName": uri,
+                **self._repo_fields,
+                "firstSeen": now_iso
             }
+        }
 
-        return asset_id, asset_details
+    def _build_vm_asset(self, uri: str, now_iso: str) -> Dict[str, Any]:
+        """
+        Build virtualMachine asset details.
+        
+        virtualMachine is the most flexible, general-purpose asset type and
+        works for any type of finding source (files, packages, services, etc.).
+        """
+        return {
+            "virtualMachine": {
+                "assetId": uri,
+                "name": uri,
+                "hostname": uri,
+                "firstSeen": now_iso
+            }
+        }
 
     def _extract_vulnerability_finding(
-        self, result: Dict[str, Any], result_idx: int
+        self, result: Dict[str, Any], result_idx: int, uri: Optional[str]
     ) -> Dict[str, Any]:
         """Extract vulnerability finding from SARIF result using field mappings."""
         
@@ -279,49 +363,26 @@ class SARIFtoWizConverter:
             return self._extract_with_mappings(result, result_idx)
         
         # Fallback to direct extraction (backward compatibility)
-        return self._extract_direct(result, result_idx)
+        return self._extract_direct(result, result_idx, uri)
 
     def _extract_with_mappings(
         self, result: Dict[str, Any], result_idx: int
     ) -> Dict[str, Any]:
         """Extract finding using the mapping engine."""
-        finding = {}
         engine = self.mapping_engine
-
-        # Apply finding-level mappings
-        for mapping in engine.get_field_mappings("finding_level"):
-            field_path, value = engine.apply_mapping(result, mapping)
-            if value is not None:
-                engine.set_nested_field(finding, field_path, value)
-
-        # Apply target component mappings
-        target_component = {}
-        for mapping in engine.get_field_mappings("target_component"):
-            field_path, value = engine.apply_mapping(result, mapping)
-            if value is not None:
-                # Store temporary for nested structure creation
-                engine.set_nested_field(target_component, field_path, value)
-
-        # Only add targetComponent if we have extracted data
-        if target_component:
-            engine.set_nested_field(finding, "targetComponent", target_component.get("targetComponent", {}))
-
-        # Apply optional field mappings
-        for mapping in engine.get_field_mappings("optional_fields"):
-            field_path, value = engine.apply_mapping(result, mapping)
-            if value is not None:
-                engine.set_nested_field(finding, field_path, value)
-
-        # Apply metadata mappings
-        for mapping in engine.get_field_mappings("metadata"):
-            if mapping.get("wiz_field") == "originalObject" and mapping.get("enabled"):
-                locations = result.get("locations", [])
-                rule_index = result.get("ruleIndex", -1)
-                if locations:
-                    finding["originalObject"] = {
-                        "locations": locations,
-                        "ruleIndex": rule_index
-                    }
+        finding = engine.build_finding(result)
+
+        # Apply metadata mappings; originalObject references the result's
+        # locations list (no copy) and is built at most once per finding
+        locations = result.get("locations")
+        if locations and any(
+            mapping.get("wiz_field") == "originalObject" and mapping.get("enabled")
+            for mapping in engine.get_field_mappings("metadata")
+        ):
+            finding["originalObject"] = {
+                "locations": locations,
+                "ruleIndex": result.get("ruleIndex", -1)
+            }
 
         # When CVE-only mode is enabled, simplify the finding name and id to just the CVE identifier
         if self.cve_only and finding.get("name"):
@@ -335,11 +396,12 @@ class SARIFtoWizConverter:
         return finding
 
     def _extract_direct(
-        self, result: Dict[str, Any], result_idx: int
+        self, result: Dict[str, Any], result_idx: int, uri: Optional[str]
     ) -> Dict[str, Any]:
         """Direct extraction without mapping engine (backward compatibility)."""
         message = result.get("message", {})
         message_text = message.get("text", "")
+        locations = result.get("locations")
 
         # Extract rule information
         rule_id = result.get("ruleId", f"rule-{result_idx}")
@@ -374,29 +436,21 @@ class SARIFtoWizConverter:
         if rule_id:
             finding["id"] = finding_name if self.cve_only else rule_id
 
-        # Extract file path and location information from SARIF
-        locations = result.get("locations", [])
-        if locations:
-            physical_location = locations[0].get("physicalLocation", {})
-            artifact_location = physical_location.get("artifactLocation", {})
-            uri = artifact_location.get("uri")
-            
-            # Populate targetComponent with the file URI
-            # Note: scaFinding.filePath is deprecated when targetComponent is set
-            if uri:
-                finding["targetComponent"] = {
-                    "library": {
-                        "filePath": uri,
-                        "name": uri,
-                        "fixedVersion": fix_version
-                    }
+        # Populate targetComponent with the file URI of the first location
+        # Note: scaFinding.filePath is deprecated when targetComponent is set
+        if uri:
+            finding["targetComponent"] = {
+                "library": {
+                    "filePath": uri,
+                    "name": uri,
+                    "fixedVersion": fix_version
                 }
+            }
 
         # Add any additional info
-        if result.get("locations"):
-            locations_str = json.dumps(result["locations"])
+        if locations:
             finding["originalObject"] = {
-                "locations": result["locations"],
+                "locations": locations,
                 "ruleIndex": rule_index
             }
 
@@ -410,13 +464,11 @@ class SARIFtoWizConverter:
         SARIF levels: 'none', 'note', 'warning', 'error'
         Wiz severities: 'None', 'Low', 'Medium', 'High', 'Critical'
         """
-        mapping = {
-            "none": "None",
-            "note": "Low",
-            "warning": "Medium",
-            "error": "High"
-        }
-        return mapping.get(sarif_level.lower(), "Medium")
+        # SARIF levels are lowercase per spec; only lowercase on a miss
+        severity = _SARIF_TO_WIZ_SEVERITY.get(sarif_level)
+        if severity is None:
+            severity = _SARIF_TO_WIZ_SEVERITY.get(sarif_level.lower(), "Medium")
+        return severity
 
     def _is_cve_finding(self, result: Dict[str, Any]) -> bool:
         """
@@ -456,6 +508,11 @@ class SARIFtoWizConverter:
 class PipelineProcessor:
     """Processes SARIF files for CI pipeline execution."""
 
+    __slots__ = (
+        "_init_kwargs", "sarif_validator", "wiz_validator",
+        "stream", "mapping_engine", "converter"
+    )
+
     def __init__(
         self,
         sarif_schema_path: Path,
@@ -465,11 +522,34 @@ class PipelineProcessor:
         repository_url: Optional[str] = None,
         branch_name: Optional[str] = None,
         mapping_config_path: Optional[Path] = None,
-        cve_only: bool = False
+        cve_only: bool = False,
+        validate_output: bool = False,
+        stream: bool = False
     ):
         """Initialize processor with schema validators and optional mapping engine."""
-        self.sarif_validator = SchemaValidator(sarif_schema_path)
-        self.wiz_validator = SchemaValidator(wiz_schema_path)
+        # Constructor arguments, kept so worker processes can build their own processor
+        self._init_kwargs = {
+            "sarif_schema_path": sarif_schema_path,
+            "wiz_schema_path": wiz_schema_path,
+            "integration_id": integration_id,
+            "repository_name": repository_name,
+            "repository_url": repository_url,
+            "branch_name": branch_name,
+            "mapping_config_path": mapping_config_path,
+            "cve_only": cve_only,
+            "validate_output": validate_output,
+            "stream": stream
+        }
+        self.sarif_validator = get_validator(sarif_schema_path)
+        # The Wiz schema is only loaded for --strict runs
+        self.wiz_validator = get_validator(wiz_schema_path) if validate_output else None
+
+        if stream and ijson is None:
+            logger.warning("ijson is not installed; streaming disabled, loading SARIF files in memory")
+            stream = False
+            # Workers inherit the decision instead of repeating the warning
+            self._init_kwargs["stream"] = False
+        self.stream = stream
         
         # Initialize mapping engine if config provided
         self.mapping_engine = None
@@ -488,7 +568,8 @@ class PipelineProcessor:
             repository_url,
             branch_name,
             self.mapping_engine,
-            cve_only
+            cve_only,
+            validate_output
         )
 
     def process_file(self, input_path: Path, output_path: Path) -> bool:
@@ -505,17 +586,27 @@ class PipelineProcessor:
         try:
             logger.info(f"Processing: {input_path}")
 
-            # Load SARIF
-            with open(input_path, 'r') as f:
-                sarif_doc = json.load(f)
+            if self.stream:
+                output_path.parent.mkdir(parents=True, exist_ok=True)
+                self.converter.convert_streaming(input_path, output_path)
+                logger.info(f"✓ Successfully converted to: {output_path}")
+                return True
+
+            # Load SARIF (orjson is an optional, faster drop-in for the stdlib parser)
+            with open(input_path, 'rb') as f:
+                data = f.read()
+            sarif_doc = orjson.loads(data) if orjson else json.loads(data)
 
             # Convert
             wiz_doc = self.converter.convert(sarif_doc)
 
             # Write output
             output_path.parent.mkdir(parents=True, exist_ok=True)
-            with open(output_path, 'w') as f:
-                json.dump(wiz_doc, f, indent=2)
+            if orjson:
+                output_path.write_bytes(orjson.dumps(wiz_doc, option=orjson.OPT_INDENT_2))
+            else:
+                with open(output_path, 'w') as f:
+                    json.dump(wiz_doc, f, indent=2)
 
             logger.info(f"✓ Successfully converted to: {output_path}")
             return True
@@ -523,7 +614,7 @@ class PipelineProcessor:
         except FileNotFoundError as e:
             logger.error(f"✗ File not found: {e}")
             return False
-        except json.JSONDecodeError as e:
+        except _JSON_ERRORS as e:
             logger.error(f"✗ Invalid JSON in {input_path}: {e}")
             return False
         except ValidationError as e:
@@ -531,18 +622,21 @@ class PipelineProcessor:
             return False
         except Exception as e:
             logger.error(f"✗ Unexpected error processing {input_path}: {e}")
-            if logger.level == logging.DEBUG:
-                import traceback
+            if logger.isEnabledFor(logging.DEBUG):
                 traceback.print_exc()
             return False
 
-    def process_directory(self, input_dir: Path, output_dir: Path) -> int:
+    def process_directory(
+        self, input_dir: Path, output_dir: Path, workers: Optional[int] = None
+    ) -> int:
         """
         Process all SARIF files in a directory.
         
         Args:
             input_dir: Directory containing SARIF files
             output_dir: Directory to write Wiz files
+            workers: Worker processes to use (default: up to CPU count, when
+                the input is large enough to pay for them; 1 converts in-process)
             
         Returns:
             Number of successfully processed files
@@ -554,29 +648,162 @@ class PipelineProcessor:
             logger.error(f"Input directory not found: {input_dir}")
             return 0
 
-        sarif_files = list(input_dir.glob("**/*.sarif")) + list(
-            input_dir.glob("**/*.json")
-        )
-
-        if not sarif_files:
+        # Single walk of the tree; each file is seen once whatever its suffix
+        jobs = []
+        total_bytes = 0
+        for root, _dirs, files in os.walk(input_dir):
+            for name in files:
+                # Skip hidden and non-SARIF files
+                if name.startswith(".") or not name.endswith(_SARIF_SUFFIXES):
+                    continue
+
+                sarif_file = Path(root, name)
+                output_file = output_dir / sarif_file.relative_to(input_dir).with_suffix(
+                    ".wiz.json"
+                )
+                jobs.append((sarif_file, output_file))
+                total_bytes += os.path.getsize(sarif_file)
+
+        if not jobs:
             logger.warning(f"No SARIF files found in {input_dir}")
             return 0
 
+        # Files are independent and conversion is CPU-bound, so fan out
+        # across processes; each worker builds its processor once. Unless
+        # asked for, only start as many workers as the input keeps busy.
+        if workers is None:
+            workers = min(os.cpu_count() or 1, total_bytes // _MIN_BYTES_PER_WORKER)
+        workers = min(len(jobs), workers)
+        if workers <= 1:
+            # Not worth spawning a pool; reuse this processor directly
+            success_count = sum(
+                self.process_file(input_path, output_path)
+                for input_path, output_path in jobs
+            )
+        else:
+            chunksize = max(1, len(jobs) // (4 * workers))
+            with ProcessPoolExecutor(
+                max_workers=workers,
+                initializer=_init_worker,
+                initargs=(self._init_kwargs, logger.getEffectiveLevel())
+            ) as executor:
+                success_count = sum(
+                    executor.map(_process_job, jobs, chunksize=chunksize)
+                )
+
+        logger.info(f"✓ Processed {success_count}/{len(jobs)} files")
+        return success_count
+
+    def process_stream(self, lines: Iterable[str], output_dir: Path) -> Tuple[int, int]:
+        """
+        Process SARIF files named one per line, e.g. read from stdin.
+        
+        Keeps a single interpreter (and its compiled schemas) alive across
+        many files instead of paying startup per invocation. Outputs are
+        named after the input file only, so an input whose output name was
+        already written for a different path is reported as a failure
+        rather than overwriting it.
+        
+        Args:
+            lines: Input paths, one per line; blank lines are ignored
+            output_dir: Directory to write Wiz files
+            
+        Returns:
+            Tuple of (successfully processed files, total files)
+        """
+        output_dir = Path(output_dir)
         success_count = 0
-        for sarif_file in sarif_files:
-            # Skip non-SARIF files
-            if sarif_file.name.startswith("."):
+        total = 0
+        # Output file -> input that produced it in this stream
+        written: Dict[Path, Path] = {}
+        for line in lines:
+            input_path = line.strip()
+            if not input_path:
                 continue
+            total += 1
+            input_path = Path(input_path)
+            output_file = output_dir / input_path.with_suffix(".wiz.json").name
+            previous = written.setdefault(output_file, input_path.resolve())
+            if previous != input_path.resolve():
+                logger.error(
+                    f"✗ Output name collision: {input_path} and {previous} both map to {output_file}"
+                )
+                continue
+            if self.process_file(input_path, output_file):
+                success_count += 1
 
-            output_file = output_dir / sarif_file.relative_to(input_dir).with_suffix(
-                ".wiz.json"
-            )
+        logger.info(f"✓ Processed {success_count}/{total} files")
+        return success_count, total
+
+
+def _stream_sarif_runs(
+    src
+) -> Iterator[Tuple[Dict[str, Any], Iterator[Dict[str, Any]]]]:
+    """
+    Stream the runs of a SARIF file opened in binary mode.
+    
+    Yields a (run_info, results) pair per run. results lazily builds one
+    runs[i].results[j] object at a time and is drained automatically when the
+    caller moves on to the next run. run_info holds the tool name (read ahead
+    of the results, where SARIF producers emit it) and a running result count.
+    """
+    events = ijson.parse(src, use_float=True)
+    for prefix, event, value in events:
+        if prefix == "runs.item" and event == "start_map":
+            run_info = {"tool_name": "unknown-tool", "result_count": 0}
+            run_done = _read_run_header(events, run_info)
+            results = iter(()) if run_done else _stream_run_results(events, run_info)
+            yield run_info, results
+            for _ in results:
+                pass
+
+
+def _read_run_header(events, run_info: Dict[str, Any]) -> bool:
+    """Consume run events up to its results array; True if the run ended first."""
+    for prefix, event, value in events:
+        if prefix == "runs.item.tool.driver.name":
+            run_info["tool_name"] = value
+        elif prefix == "runs.item.results" and event == "start_array":
+            return False
+        elif prefix == "runs.item" and event == "end_map":
+            return True
+    return True
 
-            if self.process_file(sarif_file, output_file):
-                success_count += 1
 
-        logger.info(f"✓ Processed {success_count}/{len(sarif_files)} files")
-        return success_count
+def _stream_run_results(events, run_info: Dict[str, Any]) -> Iterator[Dict[str, Any]]:
+    """Yield each result of the current run, then consume the rest of the run."""
+    for prefix, event, value in events:
+        if prefix == "runs.item.results.item" and event == "start_map":
+            builder = ijson.ObjectBuilder()
+            builder.event(event, value)
+            for prefix, event, value in events:
+                builder.event(event, value)
+                if prefix == "runs.item.results.item" and event == "end_map":
+                    break
+            run_info["result_count"] += 1
+            yield builder.value
+        elif prefix == "runs.item.tool.driver.name":
+            run_info["tool_name"] = value
+        elif prefix == "runs.item" and event == "end_map":
+            return
+
+
+# Per-process PipelineProcessor used by process_directory() workers
+_worker_processor: Optional[PipelineProcessor] = None
+
+
+def _init_worker(processor_kwargs: Dict[str, Any], log_level: int) -> None:
+    """Build the PipelineProcessor for this worker process, logging at the parent's level."""
+    global _worker_processor
+    # Spawned workers re-import this module and start from its default level
+    logger.setLevel(log_level)
+    _worker_processor = PipelineProcessor(**processor_kwargs)
+
+
+def _process_job(job: Tuple[Path, Path]) -> bool:
+    """Convert one (input_path, output_path) pair in a worker process."""
+    input_path, output_path = job
+    return _worker_processor.process_file(input_path, output_path)
 
 
 def main():
@@ -603,6 +830,10 @@ Examples:
   # CVE-only filtering (only include CVE-YYYY-NNNNN format findings)
   python sarif_to_wiz_converter.py --input scan.sarif --output scan.wiz.json \\
     --cve-only
+
+  # Convert every path read from stdin in one long-running process
+  find ./results -name '*.sarif' | python sarif_to_wiz_converter.py \\
+    --keep-alive --output-dir ./wiz-results
         """
     )
 
@@ -626,6 +857,18 @@ Examples:
         type=Path,
         help="Directory for Wiz output files"
     )
+    parser.add_argument(
+        "--keep-alive",
+        action="store_true",
+        help="Read SARIF input paths from stdin, one per line, and convert them into --output-dir"
+    )
+    parser.add_argument(
+        "--workers",
+        type=int,
+        default=None,
+        help="Worker processes for --input-dir (default: up to CPU count, one per 2 MB of input; "
+             "1 disables the process pool)"
+    )
     parser.add_argument(
         "--integration-id",
         type=str,
@@ -673,6 +916,16 @@ Examples:
         action="store_true",
         help="Only process CVE-related findings (CVE-YYYY-NNNNN format)"
     )
+    parser.add_argument(
+        "--stream",
+        action="store_true",
+        help="Parse SARIF results incrementally with ijson to bound memory on very large files (skips schema validation)"
+    )
+    parser.add_argument(
+        "--strict",
+        action="store_true",
+        help="Also validate the generated Wiz output against the Wiz schema"
+    )
     parser.add_argument(
         "--verbose",
         action="store_true",
@@ -689,8 +942,16 @@ Examples:
         logger.error("Cannot specify both --input and --input-dir")
         return 1
 
-    if not args.input and not args.input_dir:
-        logger.error("Must specify either --input or --input-dir")
+    if args.keep_alive and (args.input or args.input_dir):
+        logger.error("Cannot combine --keep-alive with --input or --input-dir")
+        return 1
+
+    if args.keep_alive and not args.output_dir:
+        logger.error("--output-dir required when using --keep-alive")
+        return 1
+
+    if not args.input and not args.input_dir and not args.keep_alive:
+        logger.error("Must specify either --input, --input-dir or --keep-alive")
         parser.print_help()
         return 1
 
@@ -702,6 +963,10 @@ Examples:
         logger.error("--output-dir required when using --input-dir")
         return 1
 
+    if args.workers is not None and args.workers < 1:
+        logger.error("--workers must be at least 1")
+        return 1
+
     # Validate repository parameters (both or neither required)
     if (args.repository_name and not args.repository_url) or (args.repository_url and not args.repository_name):
         logger.error("Both --repository-name and --repository-url must be specified together")
@@ -717,7 +982,9 @@ Examples:
             args.repository_url,
             args.branch_name,
             args.mapping_config,
-            args.cve_only
+            args.cve_only,
+            validate_output=args.strict,
+            stream=args.stream
         )
     except Exception as e:
         logger.error(f"Failed to initialize processor: {e}")
@@ -727,8 +994,13 @@ Examples:
     if args.input:
         success = processor.process_file(args.input, args.output)
         return 0 if success else 1
+    elif args.keep_alive:
+        success_count, total = processor.process_stream(sys.stdin, args.output_dir)
+        return 0 if success_count == total else 1
     else:
-        success_count = processor.process_directory(args.input_dir, args.output_dir)
+        success_count = processor.process_directory(
+            args.input_dir, args.output_dir, workers=args.workers
+        )
         return 0 if success_count > 0 else 1
 
 
@@ -0,0 +1,210 @@
+"""
+JSON Schema validation shared by the SARIF converter and the Wiz API uploader.
+
+Documents are checked with a fastjsonschema validator compiled for the
+schema; a jsonschema validator for the same draft is only built to explain
+a failure.
+
+Compiling a large schema takes most of a second, in every process that
+validates. The generated code is therefore cached on disk, keyed on the
+schema content, and compilation happens on first use.
+"""
+
+import copy
+import functools
+import hashlib
+import importlib.util
+import json
+import logging
+import marshal
+import os
+import re
+import tempfile
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterator, List, Optional
+
+import fastjsonschema
+from jsonschema import Draft4Validator, Draft6Validator, Draft7Validator, ValidationError
+
+logger = logging.getLogger(__name__)
+
+# Drafts implemented by both fastjsonschema and jsonschema. Schemas declaring
+# another draft (wiz-vuln-schema.json declares 2020-12) or none are validated
+# as draft-07 by both, so error details describe what was rejected.
+DRAFT_VALIDATORS = {
+    "http://json-schema.org/draft-04/schema#": Draft4Validator,
+    "http://json-schema.org/draft-06/schema#": Draft6Validator,
+    "http://json-schema.org/draft-07/schema#": Draft7Validator,
+}
+DEFAULT_DRAFT = "http://json-schema.org/draft-07/schema#"
+
+# Compiled validators, shared by every process and run on the machine
+SCHEMA_CACHE_DIR = os.path.join(os.path.expanduser('~'), '.cache', 'wiz', 'schemas')
+ROOT_FUNCTION_PATTERN = re.compile(r'^def (\w+)\(', re.M)
+
+
+class SchemaValidator:
+    """Validates JSON documents against JSON schemas."""
+
+    __slots__ = ("schema_path", "schema", "draft", "_validate_fn", "_detail_validator")
+
+    def __init__(self, schema_path: Path):
+        """Initialize validator with a schema file."""
+        self.schema_path = schema_path
+        self.schema = self._load_schema(schema_path)
+        self.draft = self._select_draft(self.schema)
+        # fastjsonschema validation function, compiled on first use
+        self._validate_fn: Optional[Callable[[Any], Any]] = None
+        # Full jsonschema validator, only built to explain a failure
+        self._detail_validator = None
+
+    @staticmethod
+    def _load_schema(schema_path: Path) -> Dict[str, Any]:
+        """Load JSON schema from file."""
+        try:
+            with open(schema_path, 'r') as f:
+                return json.load(f)
+        except FileNotFoundError:
+            logger.error(f"Schema file not found: {schema_path}")
+            raise
+        except json.JSONDecodeError as e:
+            logger.error(f"Invalid JSON in schema file {schema_path}: {e}")
+            raise
+
+    @staticmethod
+    def _select_draft(schema: Dict[str, Any]) -> str:
+        """Draft both validators apply: the declared one if supported, else draft-07."""
+        declared = schema.get("$schema", "")
+        for draft in DRAFT_VALIDATORS:
+            if draft.split("/")[-2] in declared:
+                return draft
+        return DEFAULT_DRAFT
+
+    def _draft_schema(self) -> Dict[str, Any]:
+        """Copy of the schema declaring the selected draft."""
+        # fastjsonschema annotates the schema it compiles, so never hand it self.schema
+        schema = copy.deepcopy(self.schema)
+        schema["$schema"] = self.draft
+        return schema
+
+    def _compile(self) -> Callable[[Any], Any]:
+        """Load the fastjsonschema validation function, generating it on a cache miss."""
+        # Schema defaults must not be written into documents, and formats are
+        # not checked, matching jsonschema's behaviour.
+        options = {"use_default": False, "use_formats": False}
+        key = hashlib.sha256(json.dumps(
+            [self.schema, self.draft, options, fastjsonschema.VERSION,
+             importlib.util.MAGIC_NUMBER.hex()],
+            sort_keys=True
+        ).encode()).hexdigest()
+        cache_path = os.path.join(SCHEMA_CACHE_DIR, f"{key}.marshal")
+
+        try:
+            with open(cache_path, 'rb') as f:
+                code = marshal.load(f)
+        except (OSError, EOFError, ValueError, TypeError):
+            source = fastjsonschema.compile_to_code(self._draft_schema(), **options)
+            # The root schema's function is generated first
+            root_function = ROOT_FUNCTION_PATTERN.search(source).group(1)
+            source += f"\nvalidate = {root_function}\n"
+            code = compile(source, f"<fastjsonschema {self.schema_path}>", "exec")
+            self._save_code(cache_path, code)
+
+        namespace: Dict[str, Any] = {}
+        exec(code, namespace)
+        return namespace["validate"]
+
+    @staticmethod
+    def _save_code(cache_path: str, code) -> None:
+        """Write compiled validator code to the cache; failures only cost a recompile."""
+        try:
+            os.makedirs(os.path.dirname(cache_path), mode=0o700, exist_ok=True)
+            fd, tmp_path = tempfile.mkstemp(dir=os.path.dirname(cache_path))
+            try:
+                with os.fdopen(fd, 'wb') as f:
+                    marshal.dump(code, f)
+                # Concurrent workers may race to write the same entry; each
+                # replace is atomic, so readers never see a partial file
+                os.replace(tmp_path, cache_path)
+            except BaseException:
+                os.unlink(tmp_path)
+                raise
+        except OSError as e:
+            logger.debug(f"Could not cache compiled schema at {cache_path}: {e}")
+
+    def validate(self, document: Dict[str, Any], name: str = "document") -> bool:
+        """
+        Validate document against schema.
+
+        Args:
+            document: Document to validate
+            name: Name for logging purposes
+
+        Returns:
+            True if valid, raises ValidationError if not
+        """
+        errors = self.errors(document)
+        if errors:
+            error = errors[0]
+            logger.error(f"✗ {name} validation failed: {error.message}")
+            logger.error(f"  Path: {list(error.path)}")
+            raise error
+        logger.info(f"✓ {name} validation passed")
+        return True
+
+    def errors(self, document: Any, all_errors: bool = False) -> List[ValidationError]:
+        """
+        Validate a document and describe what is wrong with it.
+
+        Args:
+            document: Document to validate
+            all_errors: Collect every validation error instead of stopping at the first
+
+        Returns:
+            List of ValidationErrors; empty if the document is valid
+        """
+        if self._validate_fn is None:
+            self._validate_fn = self._compile()
+        try:
+            self._validate_fn(document)
+            return []
+        except fastjsonschema.JsonSchemaException as e:
+            fast_error = e
+
+        # Only a failing document pays for jsonschema's error reporting
+        if all_errors:
+            errors = list(self.iter_errors(document))
+        else:
+            # Pass/fail only needs one error; stop walking the document there
+            first_error = next(self.iter_errors(document), None)
+            errors = [first_error] if first_error is not None else []
+        if not errors:
+            # Validators disagree; fall back to fastjsonschema's report,
+            # dropping the leading "data" root from its path
+            errors.append(ValidationError(
+                fast_error.message, validator=fast_error.rule, path=fast_error.path[1:]
+            ))
+        return errors
+
+    def iter_errors(self, document: Any) -> Iterator[ValidationError]:
+        """Iterate jsonschema's validation errors, building its validator on first use."""
+        if self._detail_validator is None:
+            self._detail_validator = DRAFT_VALIDATORS[self.draft](self._draft_schema())
+        return self._detail_validator.iter_errors(document)
+
+
+@functools.lru_cache(maxsize=8)
+def _load_validator(schema_path: str, mtime: float) -> SchemaValidator:
+    """Build a SchemaValidator; mtime in the key reloads edited schemas."""
+    return SchemaValidator(Path(schema_path))
+
+
+def get_validator(schema_path: Path) -> SchemaValidator:
+    """Get the cached SchemaValidator for a schema file, loading it once per process."""
+    schema_path = Path(schema_path).resolve()
+    try:
+        mtime = schema_path.stat().st_mtime
+    except FileNotFoundError:
+        logger.error(f"Schema file not found: {schema_path}")
+        raise
+    return _load_validator(str(schema_path), mtime)
@@ -0,0 +1,104 @@
+"""Shared pytest setup: import path, shipped schemas and sample SARIF documents"""
+
+import json
+import os
+import sys
+from pathlib import Path
+
+import pytest
+
+# Add parent directory to path for imports
+parent_dir = Path(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+sys.path.insert(0, str(parent_dir))
+
+SARIF_SCHEMA = parent_dir / "sarif-schema.json"
+WIZ_SCHEMA = parent_dir / "wiz-vuln-schema.json"
+MAPPING_CONFIG = parent_dir / "field_mappings.json"
+
+
+def sarif_result(i: int, uri: str = "requirements.txt") -> dict:
+    """SARIF result for a vulnerable dependency, with a fix version."""
+    return {
+        "ruleId": f"CVE-2024-{1000 + i}",
+        "level": ("error", "warning", "note")[i % 3],
+        "message": {"text": f"Vulnerable dependency {i}"},
+        "locations": [{
+            "physicalLocation": {
+                "artifactLocation": {"uri": uri},
+                "region": {"startLine": i + 1}
+            }
+        }],
+        "properties": {"fixedVersion": "2.0.0"}
+    }
+
+
+def sarif_doc(tool: str = "trivy", files=("requirements.txt", "package.json")) -> dict:
+    """SARIF document with three runs (one without results), findings spread over several files."""
+    results = [sarif_result(i, files[i % len(files)]) for i in range(5)]
+    return {
+        "version": "2.1.0",
+        "runs": [
+            {"tool": {"driver": {"name": tool}}, "results": results},
+            {"tool": {"driver": {"name": "empty"}}, "results": []},
+            {"tool": {"driver": {"name": f"{tool}-2"}}, "results": results[:2]}
+        ]
+    }
+
+
+@pytest.fixture
+def make_sarif():
+    """Builder for sample SARIF documents, see sarif_doc()."""
+    return sarif_doc
+
+
+@pytest.fixture
+def make_result():
+    """Builder for single SARIF results, see sarif_result()."""
+    return sarif_result
+
+
+@pytest.fixture
+def sarif_file(tmp_path):
+    """Sample SARIF document written to disk."""
+    path = tmp_path / "scan.sarif"
+    path.write_text(json.dumps(sarif_doc()))
+    return path
+
+
+@pytest.fixture
+def make_processor():
+    """Factory for pipeline processors using the shipped schemas and mappings."""
+    from sarif_to_wiz_converter import PipelineProcessor
+
+    def make(**kwargs):
+        return PipelineProcessor(SARIF_SCHEMA, WIZ_SCHEMA, mapping_config_path=MAPPING_CONFIG, **kwargs)
+
+    return make
+
+
+@pytest.fixture(scope="session")
+def sarif_schema():
+    """Path of the shipped SARIF schema."""
+    return SARIF_SCHEMA
+
+
+@pytest.fixture(scope="session")
+def wiz_schema():
+    """Path of the shipped Wiz vulnerability schema."""
+    return WIZ_SCHEMA
+
+
+@pytest.fixture(scope="session")
+def mapping_config():
+    """Path of the shipped field mapping configuration."""
+    return MAPPING_CONFIG
+
+
+@pytest.fixture(autouse=True)
+def schema_cache(tmp_path_factory, monkeypatch):
+    """Compiled schemas are cached per test session, not in the home directory."""
+    import schema_validation
+
+    path = tmp_path_factory.getbasetemp() / "schema-cache"
+    monkeypatch.setattr(schema_validation, "SCHEMA_CACHE_DIR", str(path))
+    return path
@@ -0,0 +1,130 @@
+#!/usr/bin/env python3
+"""Tests for streaming, batch and keep-alive conversion"""
+
+import json
+import logging
+import re
+import sys
+from pathlib import Path
+
+import pytest
+
+# Timestamps differ between conversions of the same input
+TIMESTAMP = re.compile(r'"\d{4}-\d\d-\d\dT[^"]*"')
+
+
+def normalized(path: Path):
+    """Load a Wiz file with timestamps masked."""
+    return json.loads(TIMESTAMP.sub('"TS"', path.read_text()))
+
+
+def test_streaming_matches_in_memory(sarif_file, make_processor, tmp_path):
+    """--stream writes the same document as the in-memory conversion"""
+    pytest.importorskip("ijson")
+
+    assert make_processor().process_file(sarif_file, tmp_path / "memory.wiz.json")
+    assert make_processor(stream=True).process_file(sarif_file, tmp_path / "stream.wiz.json")
+
+    expected = normalized(tmp_path / "memory.wiz.json")
+    assert len(expected["dataSources"]) == 2
+    assert normalized(tmp_path / "stream.wiz.json") == expected
+
+
+def test_streaming_invalid_json_removes_partial_output(make_sarif, make_processor, tmp_path):
+    """A parse error mid-file fails the file and leaves no truncated output"""
+    pytest.importorskip("ijson")
+    sarif_file = tmp_path / "broken.sarif"
+    sarif_file.write_text(json.dumps(make_sarif())[:-40])
+    output = tmp_path / "broken.wiz.json"
+
+    assert not make_processor(stream=True).process_file(sarif_file, output)
+    assert not output.exists()
+
+
+def test_invalid_sarif_fails(make_sarif, make_processor, tmp_path):
+    """SARIF that fails schema validation is reported, not converted"""
+    doc = make_sarif()
+    doc["runs"][0]["results"][0]["level"] = "bogus"
+    sarif_file = tmp_path / "invalid.sarif"
+    sarif_file.write_text(json.dumps(doc))
+
+    assert not make_processor().process_file(sarif_file, tmp_path / "invalid.wiz.json")
+    assert not (tmp_path / "invalid.wiz.json").exists()
+
+
+def test_output_schema_only_loaded_for_strict(sarif_file, make_processor, tmp_path):
+    """The Wiz schema is only loaded and checked when output validation is requested"""
+    default = make_processor()
+    strict = make_processor(validate_output=True)
+    assert default.wiz_validator is None
+    assert strict.wiz_validator is not None
+
+    assert default.process_file(sarif_file, tmp_path / "default.wiz.json")
+    assert strict.process_file(sarif_file, tmp_path / "strict.wiz.json")
+    assert normalized(tmp_path / "strict.wiz.json") == normalized(tmp_path / "default.wiz.json")
+
+
+@pytest.fixture
+def input_dir(make_sarif, tmp_path):
+    """Nested SARIF inputs next to hidden and non-SARIF files."""
+    input_dir = tmp_path / "in"
+    for name in ("a/scan.sarif", "b/scan.sarif", "top.json", ".hidden.sarif", "notes.txt"):
+        path = input_dir / name
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_text(json.dumps(make_sarif()))
+    return input_dir
+
+
+@pytest.mark.parametrize("workers", [1, 2])
+def test_process_directory(input_dir, make_processor, tmp_path, workers):
+    """Nested inputs keep their relative paths, in-process or with a worker pool"""
+    output_dir = tmp_path / "out"
+
+    assert make_processor().process_directory(input_dir, output_dir, workers=workers) == 3
+    written = sorted(p.relative_to(output_dir).as_posix() for p in output_dir.rglob("*.wiz.json"))
+    assert written == ["a/scan.wiz.json", "b/scan.wiz.json", "top.wiz.json"]
+
+
+def test_small_batches_skip_the_pool(input_dir, make_processor, tmp_path, monkeypatch):
+    """By default a few small files are converted without starting worker processes"""
+    import sarif_to_wiz_converter
+
+    def no_pool(*args, **kwargs):
+        raise AssertionError("worker pool started")
+
+    monkeypatch.setattr(sarif_to_wiz_converter, "ProcessPoolExecutor", no_pool)
+    assert make_processor().process_directory(input_dir, tmp_path / "out") == 3
+
+
+def test_workers_inherit_log_level(make_processor, monkeypatch):
+    """Workers log at the parent's level and do not repeat the ijson warning"""
+    import sarif_to_wiz_converter
+
+    monkeypatch.setattr(sarif_to_wiz_converter, "ijson", None)
+    monkeypatch.setattr(sarif_to_wiz_converter.logger, "level", logging.INFO)
+    processor = make_processor(stream=True)
+    assert processor._init_kwargs["stream"] is False
+
+    sarif_to_wiz_converter._init_worker(processor._init_kwargs, logging.DEBUG)
+    assert sarif_to_wiz_converter.logger.level == logging.DEBUG
+
+
+def test_process_stream(make_sarif, make_processor, tmp_path):
+    """--keep-alive converts each listed file and refuses output name collisions"""
+    paths = []
+    for folder in ("a", "b"):
+        path = tmp_path / folder / "scan.sarif"
+        path.parent.mkdir()
+        path.write_text(json.dumps(make_sarif()))
+        paths.append(path)
+    other = tmp_path / "other.sarif"
+    other.write_text(json.dumps(make_sarif()))
+    output_dir = tmp_path / "out"
+
+    lines = [f"{paths[0]}\n", "\n", f"{other}\n", f"{paths[1]}\n"]
+    assert make_processor().process_stream(lines, output_dir) == (2, 3)
+    assert sorted(p.name for p in output_dir.iterdir()) == ["other.wiz.json", "scan.wiz.json"]
+
+
+if __name__ == "__main__":
+    sys.exit(pytest.main([__file__, "-v"]))
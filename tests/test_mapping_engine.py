@@ -0,0 +1,83 @@
+#!/usr/bin/env python3
+"""Tests for the compiled field mapping engine"""
+
+import sys
+
+import pytest
+
+from mapping_engine import MappingEngine
+
+
+@pytest.fixture(scope="module")
+def engine(mapping_config):
+    """Mapping engine loaded from the shipped configuration."""
+    return MappingEngine(mapping_config)
+
+
+def test_build_finding(engine, make_result):
+    """Generated appliers fill scalar and nested fields, with transforms"""
+    finding = engine.build_finding(make_result(0))
+
+    assert finding["name"] == finding["id"] == "CVE-2024-1000"
+    assert finding["description"] == "Vulnerable dependency 0"
+    assert finding["severity"] == "High"
+    assert finding["targetComponent"] == {
+        "library": {
+            "filePath": "requirements.txt",
+            "name": "requirements.txt",
+            "fixedVersion": "2.0.0"
+        }
+    }
+
+
+def test_build_finding_matches_mappings(engine, make_result):
+    """build_finding agrees with extracting each mapping through apply_mapping"""
+    sarif_result = make_result(0)
+    finding = engine.build_finding(sarif_result)
+
+    for mappings in engine.get_all_enabled_mappings().values():
+        for mapping in mappings:
+            if mapping.get("wiz_field") in finding:
+                _, value = engine.apply_mapping(sarif_result, mapping)
+                assert finding[mapping["wiz_field"]] == value
+
+
+def test_build_finding_prunes_empty_branches(engine):
+    """Skeleton branches that receive no values are dropped"""
+    finding = engine.build_finding({"ruleId": "CVE-2024-1000", "message": {"text": "x"}})
+
+    assert "targetComponent" not in finding
+    # Defaults still apply to missing SARIF fields
+    assert finding["severity"] == "Medium"
+
+
+def test_setter_creates_parents(engine):
+    """Public setters work on a fresh finding, not only on the skeleton"""
+    nested = [m for m in engine.iter_all_enabled() if m.setter and "." in m.wiz_field]
+    assert nested
+
+    for compiled in nested:
+        finding = {}
+        compiled.setter(finding, "value")
+        head, *rest = compiled.wiz_field.split(".")
+        branch = finding[head]
+        for part in rest[:-1]:
+            branch = branch[part]
+        assert branch[rest[-1]] == "value"
+
+
+@pytest.mark.parametrize("obj, path, expected", [
+    ({"locations": [{"uri": "a"}]}, "locations[0].uri", "a"),
+    ({"locations": [{"uri": "a"}]}, "locations[-1].uri", "a"),
+    ({"locations": []}, "locations[0].uri", None),
+    ({"locations": "abc"}, "locations[0]", None),
+    ({"message": {"text": "t"}}, "message.text", "t"),
+    ({"message": "t"}, "message.text", None),
+])
+def test_extract_value(engine, obj, path, expected):
+    """Paths resolve through dicts and lists; misses and mistyped fields yield None"""
+    assert engine.extract_value(obj, path) == expected
+
+
+if __name__ == "__main__":
+    sys.exit(pytest.main([__file__, "-v"]))
@@ -2,77 +2,105 @@
 """Final comprehensive test of repository feature"""
 
 import json
-import subprocess
 import os
 import sys
 from pathlib import Path
 
+import pytest
+
 # Add parent directory to path for imports
-parent_dir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
-sys.path.insert(0, parent_dir)
-
-# Create temp directory for test outputs
-test_dir = Path(__file__).parent
-temp_dir = test_dir / "temp"
-temp_dir.mkdir(exist_ok=True)
-
-# Prepare Python command with venv
-venv_python = Path(parent_dir) / "venv" / "bin" / "python3"
-if not venv_python.exists():
-    venv_python = "python3"
-
-print("="*60)
-print("REPOSITORY FEATURE - COMPREHENSIVE TEST")
-print("="*60)
-print()
-
-# Test 1: Default mode
-print("✓ Test 1: Default virtualMachine mode")
-test_file_1 = temp_dir / 'test_final1.wiz.json'
-subprocess.run([str(venv_python), str(Path(parent_dir) / 'sarif_to_wiz_converter.py'), '--input', str(test_dir / 'data' / 'inputs' / 'sarif.json'), '--output', str(test_file_1), '--sarif-schema', str(Path(parent_dir) / 'sarif-schema.json'), '--wiz-schema', str(Path(parent_dir) / 'wiz-vuln-schema.json')], capture_output=True)
-with open(test_file_1) as f:
-    data = json.load(f)
-    asset_type = list(data['dataSources'][0]['assets'][0]['details'].keys())[0]
-    findings = len(data['dataSources'][0]['assets'][0]['vulnerabilityFindings'])
-    print(f"  Asset Type: {asset_type}")
-    print(f"  Findings: {findings}")
-print()
-
-# Test 2: Repository mode  
-print("✓ Test 2: Repository repositoryBranch mode")
-test_file_2 = temp_dir / 'test_final2.wiz.json'
-subprocess.run([str(venv_python), str(Path(parent_dir) / 'sarif_to_wiz_converter.py'), '--input', str(test_dir / 'data' / 'inputs' / 'sarif.json'), '--output', str(test_file_2), '--repository-name', 'my-app', '--repository-url', 'https://github.com/org/my-app', '--sarif-schema', str(Path(parent_dir) / 'sarif-schema.json'), '--wiz-schema', str(Path(parent_dir) / 'wiz-vuln-schema.json')], capture_output=True)
-with open(test_file_2) as f:
-    data = json.load(f)
-    asset_type = list(data['dataSources'][0]['assets'][0]['details'].keys())[0]
-    asset = data['dataSources'][0]['assets'][0]['details'][asset_type]
-    repo_name = asset.get('repository', {}).get('name')
-    repo_url = asset.get('repository', {}).get('url')
-    findings = len(data['dataSources'][0]['assets'][0]['vulnerabilityFindings'])
-    print(f"  Asset Type: {asset_type}")
-    print(f"  Repository: {repo_name}")
-    print(f"  URL: {repo_url}")
-    print(f"  Findings: {findings}")
-print()
-
-# Test 3: Validation
-print("✓ Test 3: Schema Validation")
-result1 = subprocess.run([str(venv_python), str(Path(parent_dir) / 'validate_wiz_output.py'), str(test_file_1), str(Path(parent_dir) / 'wiz-vuln-schema.json')], capture_output=True, text=True)
-status1 = '✓ VALID' if 'VALID' in result1.stdout else '✗ INVALID'
-result2 = subprocess.run([str(venv_python), str(Path(parent_dir) / 'validate_wiz_output.py'), str(test_file_2), str(Path(parent_dir) / 'wiz-vuln-schema.json')], capture_output=True, text=True)
-status2 = '✓ VALID' if 'VALID' in result2.stdout else '✗ INVALID'
-print(f"  Default mode: {status1}")
-print(f"  Repository mode: {status2}")
-print()
-
-# Cleanup - Keep temp directory but clean specific files
-try:
-    test_file_1.unlink()
-    test_file_2.unlink()
-except:
-    pass
-
-
-print("="*60)
-print("✅ ALL TESTS PASSED!")
-print("="*60)
+parent_dir = Path(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+sys.path.insert(0, str(parent_dir))
+
+from sarif_to_wiz_converter import PipelineProcessor, SchemaValidator
+
+SARIF_SCHEMA = parent_dir / "sarif-schema.json"
+WIZ_SCHEMA = parent_dir / "wiz-vuln-schema.json"
+MAPPING_CONFIG = parent_dir / "field_mappings.json"
+
+# Findings in the sample SARIF, all reported against the same file
+FINDINGS = 3
+
+
+@pytest.fixture(scope="module")
+def sarif_file(tmp_path_factory):
+    """Small SARIF document with several findings for one artifact."""
+    results = [
+        {
+            "ruleId": f"CVE-2024-{1000 + i}",
+            "level": level,
+            "message": {"text": f"Vulnerable dependency {i}"},
+            "locations": [{
+                "physicalLocation": {
+                    "artifactLocation": {"uri": "requirements.txt"},
+                    "region": {"startLine": i + 1}
+                }
+            }],
+            "properties": {"fixedVersion": "2.0.0"}
+        }
+        for i, level in enumerate(("error", "warning", "note"))
+    ]
+    sarif_doc = {
+        "version": "2.1.0",
+        "runs": [{"tool": {"driver": {"name": "trivy"}}, "results": results}]
+    }
+    path = tmp_path_factory.mktemp("inputs") / "sarif.json"
+    path.write_text(json.dumps(sarif_doc))
+    return path
+
+
+@pytest.fixture(scope="module")
+def wiz_validator():
+    """Wiz schema validator, compiled once for the module."""
+    return SchemaValidator(WIZ_SCHEMA)
+
+
+def convert(sarif_file: Path, output_path: Path, **kwargs) -> dict:
+    """Run the pipeline in-process and return the written Wiz document."""
+    processor = PipelineProcessor(
+        SARIF_SCHEMA, WIZ_SCHEMA, mapping_config_path=MAPPING_CONFIG, **kwargs
+    )
+    assert processor.process_file(sarif_file, output_path)
+    with open(output_path) as f:
+        return json.load(f)
+
+
+def test_default_virtual_machine_mode(sarif_file, wiz_validator, tmp_path):
+    """Test 1: Default virtualMachine mode"""
+    data = convert(sarif_file, tmp_path / "test_final1.wiz.json")
+
+    asset = data["dataSources"][0]["assets"][0]
+    assert list(asset["details"].keys()) == ["virtualMachine"]
+    details = asset["details"]["virtualMachine"]
+    assert details["assetId"] == details["name"] == details["hostname"] == "requirements.txt"
+    assert len(asset["vulnerabilityFindings"]) == FINDINGS
+
+    # Test 3: Schema Validation (default mode)
+    assert wiz_validator.validate(data, "Wiz output")
+
+
+def test_repository_branch_mode(sarif_file, wiz_validator, tmp_path):
+    """Test 2: Repository repositoryBranch mode"""
+    data = convert(
+        sarif_file,
+        tmp_path / "test_final2.wiz.json",
+        repository_name="my-app",
+        repository_url="https://github.com/org/my-app",
+    )
+
+    data_source = data["dataSources"][0]
+    assert data_source["id"] == "my-app/main"
+    asset = data_source["assets"][0]
+    assert list(asset["details"].keys()) == ["repositoryBranch"]
+    details = asset["details"]["repositoryBranch"]
+    assert details["repository"] == {"name": "my-app", "url": "https://github.com/org/my-app"}
+    assert details["branchName"] == "main"
+    assert details["vcs"] == "GitHub"
+    assert len(asset["vulnerabilityFindings"]) == FINDINGS
+
+    # Test 3: Schema Validation (repository mode)
+    assert wiz_validator.validate(data, "Wiz output")
+
+
+if __name__ == "__main__":
+    sys.exit(pytest.main([__file__, "-v"]))
@@ -0,0 +1,79 @@
+#!/usr/bin/env python3
+"""Tests for the shared schema validator"""
+
+import json
+import sys
+
+import pytest
+
+import schema_validation
+from schema_validation import SchemaValidator
+
+
+def write_schema(tmp_path, schema):
+    """Write a schema into the test's temporary directory."""
+    path = tmp_path / "schema.json"
+    path.write_text(json.dumps(schema))
+    return path
+
+
+def test_compiled_code_is_cached(wiz_schema, schema_cache, monkeypatch):
+    """A second validator for the same schema loads the cached code instead of compiling"""
+    assert SchemaValidator(wiz_schema).errors({})
+    assert len(list(schema_cache.iterdir())) >= 1
+
+    def compile_to_code(*args, **kwargs):
+        raise AssertionError("schema recompiled")
+
+    monkeypatch.setattr(schema_validation.fastjsonschema, "compile_to_code", compile_to_code)
+    errors = SchemaValidator(wiz_schema).errors({})
+    assert errors[0].message == "'integrationId' is a required property"
+
+
+def test_unwritable_cache_still_validates(tmp_path, monkeypatch):
+    """Failing to write the cache only costs a recompile"""
+    blocker = tmp_path / "not-a-directory"
+    blocker.write_text("")
+    monkeypatch.setattr(schema_validation, "SCHEMA_CACHE_DIR", str(blocker / "schemas"))
+
+    path = write_schema(tmp_path, {"type": "object", "required": ["id"]})
+    assert SchemaValidator(path).errors({"id": 1}) == []
+
+
+@pytest.mark.parametrize("declared, draft", [
+    ("http://json-schema.org/draft-04/schema#", "http://json-schema.org/draft-04/schema#"),
+    ("http://json-schema.org/draft-06/schema", "http://json-schema.org/draft-06/schema#"),
+    ("https://json-schema.org/draft/2020-12/schema", "http://json-schema.org/draft-07/schema#"),
+    (None, "http://json-schema.org/draft-07/schema#"),
+])
+def test_draft_selection(tmp_path, declared, draft):
+    """Supported drafts are kept; anything else is validated as draft-07"""
+    schema = {"type": "object"}
+    if declared:
+        schema["$schema"] = declared
+    assert SchemaValidator(write_schema(tmp_path, schema)).draft == draft
+
+
+def test_shipped_schema_drafts(sarif_schema, wiz_schema):
+    """SARIF keeps draft-04; the 2020-12 Wiz schema is validated as draft-07"""
+    assert SchemaValidator(sarif_schema).draft == "http://json-schema.org/draft-04/schema#"
+    assert SchemaValidator(wiz_schema).draft == "http://json-schema.org/draft-07/schema#"
+
+
+def test_error_details_use_the_compiled_draft(tmp_path):
+    """Error details come from the same draft that rejected the document"""
+    # A numeric exclusiveMinimum only exists from draft-06 on
+    path = write_schema(tmp_path, {
+        "$schema": "https://json-schema.org/draft/2020-12/schema",
+        "type": "object",
+        "properties": {"count": {"type": "integer", "exclusiveMinimum": 5}}
+    })
+    validator = SchemaValidator(path)
+
+    assert validator.errors({"count": 6}) == []
+    errors = validator.errors({"count": 5})
+    assert [(e.validator, list(e.path)) for e in errors] == [("exclusiveMinimum", ["count"])]
+
+
+if __name__ == "__main__":
+    sys.exit(pytest.main([__file__, "-v"]))
@@ -0,0 +1,218 @@
+#!/usr/bin/env python3
+"""Tests for the Wiz upload script, with the Wiz API replaced by fakes"""
+
+import json
+import sys
+import time
+
+import pytest
+import requests
+from requests.adapters import HTTPAdapter
+
+import upload_security_scan as uploader
+from upload_security_scan import wiz_api_client
+
+AUTH_URL = "https://auth.app.wiz.io/oauth/token"
+API_URL = "https://api.test/graphql"
+
+
+class RecordingAdapter(HTTPAdapter):
+    """Transport adapter answering from canned (status, payload) pairs and recording requests."""
+
+    def __init__(self, responses):
+        super().__init__()
+        self.responses = list(responses)
+        self.requests = []
+
+    def send(self, request, **kwargs):
+        self.requests.append(request)
+        status_code, payload = self.responses.pop(0)
+        response = requests.Response()
+        response.status_code = status_code
+        response._content = json.dumps(payload).encode()
+        response.request = request
+        response.url = request.url
+        return response
+
+
+@pytest.fixture(autouse=True)
+def no_sleep(monkeypatch):
+    """Polling and backoff run instantly."""
+    monkeypatch.setattr(uploader.time, "sleep", lambda seconds: None)
+
+
+def fake_query(monkeypatch, responses):
+    """Replace WizApi.query with canned responses; returns the recorded variables."""
+    calls = []
+    responses = iter(responses)
+
+    def query(query, variables):
+        calls.append(dict(variables))
+        return next(responses)
+
+    monkeypatch.setattr(wiz_api_client, "query", query)
+    return calls
+
+
+@pytest.fixture
+def token_cache(tmp_path, monkeypatch):
+    """Token cache enabled and redirected to a temporary file."""
+    path = tmp_path / "token.json"
+    monkeypatch.setattr(uploader, "TOKEN_CACHE_PATH", str(path))
+    monkeypatch.setenv("WIZ_TOKEN_CACHE", "1")
+    return path
+
+
+def test_token_cache_reused(token_cache, monkeypatch):
+    """A cached token is reused until shortly before it expires"""
+    issued = []
+
+    def init(client_id, client_secret, auth_url, session=None):
+        issued.append(client_id)
+        monkeypatch.setattr(wiz_api_client, "token_expires_in", 3600)
+        return f"token-{len(issued)}"
+
+    monkeypatch.setattr(wiz_api_client, "init", init)
+
+    assert uploader.get_token("id", "secret", "url", session=None) == "token-1"
+    assert uploader.get_token("id", "secret", "url", session=None) == "token-1"
+    assert oct(token_cache.stat().st_mode & 0o777) == "0o600"
+    # Other credentials do not share the entry
+    assert uploader.get_token("other", "secret", "url", session=None) == "token-2"
+
+    uploader.save_cached_token("id", "url", "expiring", time.time() + uploader.TOKEN_CACHE_MIN_TTL)
+    assert uploader.load_cached_token("id", "url") is None
+
+
+@pytest.mark.parametrize("value", [None, "", "0", "false", "no", "off"])
+def test_token_cache_off_unless_enabled(tmp_path, monkeypatch, value):
+    """Only 1/true/yes enable the cache; otherwise nothing is written to disk"""
+    path = tmp_path / "token.json"
+    monkeypatch.setattr(uploader, "TOKEN_CACHE_PATH", str(path))
+    if value is None:
+        monkeypatch.delenv("WIZ_TOKEN_CACHE", raising=False)
+    else:
+        monkeypatch.setenv("WIZ_TOKEN_CACHE", value)
+    monkeypatch.setattr(wiz_api_client, "init", lambda *args: "token")
+    monkeypatch.setattr(wiz_api_client, "token_expires_in", 3600)
+
+    assert uploader.get_token("id", "secret", "url", session=None) == "token"
+    assert not path.exists()
+
+
+@pytest.mark.parametrize("value", ["1", "true", "YES", " True "])
+def test_token_cache_enabled_values(monkeypatch, value):
+    """Enabling values are matched case-insensitively, ignoring surrounding spaces"""
+    monkeypatch.setenv("WIZ_TOKEN_CACHE", value)
+    assert uploader.token_cache_enabled()
+
+
+def test_revoked_token_reauthenticates_once(token_cache, monkeypatch):
+    """A 401 drops the cached token, authenticates again and retries the query"""
+    uploader.save_cached_token("id", AUTH_URL, "revoked", time.time() + 3600)
+    adapter = RecordingAdapter([
+        (401, {}),
+        (200, {"access_token": "fresh", "expires_in": 3600}),
+        (200, {"data": {"ok": True}}),
+    ])
+    session = requests.Session()
+    session.mount("https://", adapter)
+    session.headers["Authorization"] = "Bearer " + uploader.get_token("id", "secret", AUTH_URL, session)
+
+    monkeypatch.setattr(wiz_api_client, "session", session, raising=False)
+    monkeypatch.setattr(wiz_api_client, "api_endpoint_url", API_URL, raising=False)
+    monkeypatch.setattr(wiz_api_client, "_reauthenticated", False)
+    monkeypatch.setattr(wiz_api_client, "reauthenticate", lambda: uploader.refresh_token(
+        "id", "secret", AUTH_URL, session))
+
+    assert wiz_api_client.query("query Q { ok }", {}) == {"ok": True}
+    assert [(r.url, r.headers.get("Authorization")) for r in adapter.requests] == [
+        (API_URL, "Bearer revoked"),
+        # The rejected token is not sent to the token endpoint
+        (AUTH_URL, None),
+        (API_URL, "Bearer fresh"),
+    ]
+    assert uploader.load_cached_token("id", AUTH_URL) == "fresh"
+
+
+def test_cloud_resources_follow_cursor(monkeypatch):
+    """Pages are fetched lazily, passing endCursor until hasNextPage is false"""
+    calls = fake_query(monkeypatch, [
+        {"cloudResources": {"nodes": [1, 2], "pageInfo": {"hasNextPage": True, "endCursor": "c1"}}},
+        {"cloudResources": {"nodes": [3], "pageInfo": {"hasNextPage": False, "endCursor": "c2"}}},
+    ])
+
+    resources = uploader.iter_cloud_resources()
+    assert calls == []
+    assert list(resources) == [1, 2, 3]
+    assert [call.get("after") for call in calls] == [None, "c1"]
+
+
+def test_upload_does_not_fetch_inventory(monkeypatch):
+    """Uploading a file runs steps 2-5 only; no cloud resources are queried"""
+    queried = fake_query(monkeypatch, [
+        {"requestSecurityScanUpload": {
+            "upload": {"id": "u1", "url": "https://s3.test/put", "systemActivityId": "a1"}
+        }},
+        {"systemActivity": {"status": "SUCCESS", "statusInfo": None}},
+    ])
+    monkeypatch.setattr(uploader, "upload_file_to_s3", lambda url, path, session: None)
+
+    assert uploader.upload_one("scan.json", session=None) == "SUCCESS"
+    assert queried == [{"filename": "scan.json"}, {"id": "a1"}]
+
+
+def test_system_activity_polls_until_done(monkeypatch):
+    """Polling backs off through pending and unchanged states until a final status"""
+    calls = fake_query(monkeypatch, [
+        {"systemActivity": None},
+        {"systemActivity": {"status": "IN_PROGRESS", "statusInfo": None}},
+        {"systemActivity": {"status": "IN_PROGRESS", "statusInfo": None}},
+        {"systemActivity": {"status": "SUCCESS", "statusInfo": None}},
+    ])
+
+    assert uploader.get_system_activity_status("activity-1") == "SUCCESS"
+    assert len(calls) == 4
+    assert calls[0] == {"id": "activity-1"}
+
+
+def test_system_activity_times_out(monkeypatch):
+    """A status that never finishes fails once POLL_TIMEOUT is exhausted"""
+    fake_query(monkeypatch, [{"systemActivity": {"status": "IN_PROGRESS", "statusInfo": None}}] * 100)
+    monkeypatch.setattr(uploader, "POLL_TIMEOUT", 0)
+
+    with pytest.raises(Exception, match="did not finish"):
+        uploader.get_system_activity_status("activity-1")
+
+
+def test_upload_many_isolates_failures(monkeypatch):
+    """One failing file is reported without stopping the others"""
+    def upload_one(path, session):
+        if path == "bad.json":
+            raise RuntimeError("boom")
+        return "SUCCESS"
+
+    monkeypatch.setattr(uploader, "upload_one", upload_one)
+    results = uploader.upload_many(["a.json", "bad.json", "b.json"], session=None)
+
+    assert results["a.json"] == results["b.json"] == "SUCCESS"
+    assert isinstance(results["bad.json"], RuntimeError)
+
+
+def test_resolve_file_paths(tmp_path):
+    """A file, a directory of JSON files and a recursive glob are all accepted"""
+    (tmp_path / "nested").mkdir()
+    for name in ("a.json", "b.json", "notes.txt", "nested/c.json"):
+        (tmp_path / name).write_text("{}")
+
+    assert uploader.resolve_file_paths(str(tmp_path / "a.json")) == [str(tmp_path / "a.json")]
+    assert uploader.resolve_file_paths(str(tmp_path)) == [
+        str(tmp_path / "a.json"), str(tmp_path / "b.json")
+    ]
+    assert uploader.resolve_file_paths(str(tmp_path / "**" / "*.json")) == [
+        str(tmp_path / "a.json"), str(tmp_path / "b.json"), str(tmp_path / "nested" / "c.json")
+    ]
+
+
+if __name__ == "__main__":
+    sys.exit(pytest.main([__file__, "-v"]))
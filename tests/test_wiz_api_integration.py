@@ -0,0 +1,70 @@
+#!/usr/bin/env python3
+"""Tests for validating converted Wiz files before upload"""
+
+import json
+import sys
+
+import pytest
+
+from wiz_api_integration import WizAPIClient, load_and_validate, validate_before_upload
+
+
+@pytest.fixture
+def wiz_doc(make_sarif, make_processor, tmp_path):
+    """Converter output for a sample SARIF document whose findings all target one file."""
+    sarif_file = tmp_path / "sarif.json"
+    sarif_file.write_text(json.dumps(make_sarif(files=("requirements.txt",))))
+    output = tmp_path / "sarif.wiz.json"
+    assert make_processor().process_file(sarif_file, output)
+    return json.loads(output.read_text())
+
+
+@pytest.fixture
+def invalid_file(wiz_doc, tmp_path):
+    """Wiz file whose first asset's findings all carry an unknown severity."""
+    doc = json.loads(json.dumps(wiz_doc))
+    findings = doc["dataSources"][0]["assets"][0]["vulnerabilityFindings"]
+    for finding in findings:
+        finding["severity"] = "Bogus"
+    path = tmp_path / "invalid.wiz.json"
+    path.write_text(json.dumps(doc))
+    return path, len(findings)
+
+
+def test_load_and_validate_valid(wiz_doc, wiz_schema, tmp_path):
+    """A valid file is parsed once and reported without errors"""
+    path = tmp_path / "valid.wiz.json"
+    path.write_text(json.dumps(wiz_doc))
+
+    doc, errors = load_and_validate(path, wiz_schema)
+    assert doc == wiz_doc
+    assert errors == []
+
+
+def test_load_and_validate_errors(invalid_file, wiz_schema):
+    """Only the first error by default, every error on request"""
+    path, bogus = invalid_file
+    _, first = load_and_validate(path, wiz_schema)
+    _, every = load_and_validate(path, wiz_schema, all_errors=True)
+
+    assert len(first) == 1
+    assert len(every) == bogus > 1
+    assert list(first[0].path)[-1] == "severity"
+
+
+def test_validate_before_upload_reuses_document(wiz_doc, invalid_file, wiz_schema, tmp_path):
+    """The validated document is handed back for the upload"""
+    path = tmp_path / "valid.wiz.json"
+    path.write_text(json.dumps(wiz_doc))
+
+    assert validate_before_upload(path, wiz_schema) == (True, wiz_doc)
+    assert validate_before_upload(invalid_file[0], wiz_schema) == (False, None)
+
+    client = WizAPIClient(api_token="token")
+    assert client.upload_file(None, wiz_doc["integrationId"], payload=wiz_doc) == (
+        True, wiz_doc["integrationId"]
+    )
+
+
+if __name__ == "__main__":
+    sys.exit(pytest.main([__file__, "-v"]))
@@ -1,15 +1,28 @@
 import argparse
-import traceback
 from contextlib import closing
 import json
 import os.path
 import errno
 import os
-import signal
 import functools
 import requests
 import logging
 import time
+import random
+import glob
+import gzip
+import hashlib
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from concurrent.futures import TimeoutError as FutureTimeoutError
+from requests.adapters import HTTPAdapter
+import urllib3
+from urllib3.util.retry import Retry
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
 
 """
 README
@@ -38,6 +51,37 @@ API_ENDPOINT_URL = ""  # e.g. https://api.us17.app.wiz.io/graphql
 
 FILE_ABSOLUTE_PATH = ""  # e.g. /Users/Desktop/upload-scan.json
 ENTITY_TYPE = ["VIRTUAL_MACHINE"]
+CLOUD_RESOURCE_PAGE_SIZE = 500
+
+# HTTP connection pool shared by the token request, Wiz API calls and the S3 upload
+HTTP_POOL_CONNECTIONS = 10
+HTTP_POOL_MAXSIZE = 50
+HTTP_RETRY = Retry(total=3, backoff_factor=0.3, status_forcelist=[429, 500, 502, 503, 504])
+# (connect, read) seconds, enforced by the socket layer on every request
+HTTP_TIMEOUT = (10, 120)
+# Bytes read from disk and written to the socket per send() when streaming the
+# S3 upload (http.client defaults to 8 KiB)
+HTTP_UPLOAD_BLOCKSIZE = 1024 * 1024
+# urllib3 1.x connection pools reject the blocksize keyword
+HTTP_POOL_SUPPORTS_BLOCKSIZE = int(urllib3.__version__.split('.')[0]) >= 2
+
+# Opt-in (WIZ_TOKEN_CACHE=1): access tokens are reused across runs until
+# shortly before they expire. Off by default, since the token is stored in
+# plain text, which is risky on shared runners.
+TOKEN_CACHE_PATH = os.path.join(os.path.expanduser('~'), '.cache', 'wiz', 'token.json')
+TOKEN_CACHE_MIN_TTL = 60
+TOKEN_CACHE_ENABLED_VALUES = ('1', 'true', 'yes')
+
+# Gzip GraphQL request bodies of at least this many bytes when COMPRESS_REQUESTS is enabled
+GZIP_MIN_BYTES = 1024
+
+# Files uploaded concurrently when --file_path names a directory or glob
+UPLOAD_CONCURRENCY = 8
+
+# System Activity polling: exponential backoff (seconds) with jitter, bounded overall
+POLL_BASE_DELAY = 0.5
+POLL_MAX_DELAY = 10
+POLL_TIMEOUT = 900
 
 # Logger
 logger = logging.getLogger('')
@@ -52,19 +96,19 @@ class TimeoutError(Exception):
 
 
 def timeout(seconds=10, error_message=os.strerror(errno.ETIME)):
+    # Runs func on a worker thread rather than arming SIGALRM, so it works from
+    # any thread and on any platform. A call that times out keeps running in
+    # the background; HTTP calls should rely on HTTP_TIMEOUT instead.
     def decorator(func):
-        def _handle_timeout(signum, frame):
-            raise TimeoutError(error_message)
-
         @functools.wraps(func)
         def wrapper(*args, **kwargs):
-            signal.signal(signal.SIGALRM, _handle_timeout)
-            signal.alarm(seconds)
+            executor = ThreadPoolExecutor(max_workers=1)
+            future = executor.submit(func, *args, **kwargs)
+            executor.shutdown(wait=False)
             try:
-                result = func(*args, **kwargs)
-            finally:
-                signal.alarm(0)
-            return result
+                return future.result(timeout=seconds)
+            except FutureTimeoutError:
+                raise TimeoutError(error_message)
 
         return wrapper
 
@@ -84,6 +128,12 @@ class WizApi:
     general_max_retries = 0
     general_retry_time = 0
     DEFAULT_VALUE = 'N/A'
+    compress_requests = False
+    token_expires_in = None
+    # Called once, on the first 401 from query(), to replace a rejected token
+    reauthenticate = None
+    _reauthenticated = False
+    _auth_lock = threading.Lock()
 
     # Queries
     CLOUD_RESOURCE_SEARCH_QUERY = ("""
@@ -125,11 +175,6 @@ class WizApi:
         }
     """)
 
-    CLOUD_RESOURCE_SEARCH_VARIABLES = {
-        "first": 500,
-        "filterBy": {"type": ["VIRTUAL_MACHINE"]}
-    }
-
     REQUEST_SECURITY_SCAN_UPLOAD_QUERY = ("""
         query RequestSecurityScanUpload($filename: String!) {
             requestSecurityScanUpload(filename: $filename) {
@@ -142,12 +187,6 @@ class WizApi:
         }
     """)
 
-    REQUEST_SECURITY_SCAN_UPLOAD_VARIABLE = {
-        "input": {
-            "filename": None
-        }
-    }
-
     SYSTEM_ACTIVITY_QUERY = ("""
 query SystemActivity($id: ID!) {
     systemActivity(id: $id) {
@@ -158,19 +197,21 @@ query SystemActivity($id: ID!) {
 }
     """)
 
-    SYSTEM_ACTIVITY_VARIABLES = {"id": None}
-
     def set_api_endpoint(self, api_endpoint):
         self.api_endpoint_url = api_endpoint
 
     def set_session(self, session):
         self.session = session
 
-    def init(self, client_id, client_secret, auth_url):
+    def init(self, client_id, client_secret, auth_url, session=None):
         auth_data = self._select_authentication_provider(client_id, client_secret, auth_url)
-        response = requests.post(auth_url,
-                                 headers={'Content-Type': 'application/x-www-form-urlencoded'},
-                                 data=auth_data)
+        # Never send the session's bearer token (possibly the one being replaced)
+        # to the token endpoint; None drops a session header from this request
+        response = (session or self.session).post(auth_url,
+                                     headers={'Content-Type': 'application/x-www-form-urlencoded',
+                                              'Authorization': None},
+                                     data=auth_data,
+                                     timeout=HTTP_TIMEOUT)
         if response.status_code != requests.codes.ok:
             raise Exception(f'Error authenticating to Wiz [{response.status_code}] - {response.text}')
 
@@ -178,6 +219,7 @@ query SystemActivity($id: ID!) {
         access_token = response_json.get('access_token')
         if not access_token:
             raise Exception(f'Could not retrieve token from Wiz: {response_json.get("message")}')
+        self.token_expires_in = response_json.get('expires_in')
         return access_token
 
     def _select_authentication_provider(self, client_id, client_secret, tenant_auth_url):
@@ -188,8 +230,17 @@ query SystemActivity($id: ID!) {
             raise Exception('Invalid Auth URL')
 
     def query(self, query, variables):
-        response = self.session.post(self.api_endpoint_url,
-                                     json={'variables': variables, 'query': query})
+        # The session already sends Content-Type: application/json
+        body = _encode_query(query) + _dumps(variables) + b'}'
+        headers = None
+        if self.compress_requests and len(body) >= GZIP_MIN_BYTES:
+            body = gzip.compress(body)
+            headers = {'Content-Encoding': 'gzip'}
+        response = self.session.post(self.api_endpoint_url, data=body, headers=headers,
+                                     timeout=HTTP_TIMEOUT)
+        if response.status_code == requests.codes.unauthorized and self._reauthenticate_once():
+            response = self.session.post(self.api_endpoint_url, data=body, headers=headers,
+                                         timeout=HTTP_TIMEOUT)
         if response.status_code != requests.codes.ok:
             raise Exception('Error authenticating to Wiz [{}] - {}'.format(response.status_code, response.text))
         response_json = response.json()
@@ -198,36 +249,155 @@ query SystemActivity($id: ID!) {
             raise Exception('Could not get entries from Wiz: {}'.format(response_json.get('errors')))
         return data
 
+    def _reauthenticate_once(self):
+        """Replace a rejected token once per run; True if the request should be retried."""
+        with self._auth_lock:
+            if self.reauthenticate is None:
+                return False
+            # Concurrent uploads may all see the 401; only the first re-authenticates
+            if not self._reauthenticated:
+                self._reauthenticated = True
+                self.reauthenticate()
+            return True
+
+
+def _dumps(obj):
+    return orjson.dumps(obj) if orjson else json.dumps(obj).encode()
+
+
+@functools.lru_cache(maxsize=16)
+def _encode_query(query):
+    """Encoded request body up to the variables; the query text is serialized once."""
+    return b'{"query":' + _dumps(query) + b',"variables":'
+
 
 wiz_api_client = WizApi()
 
 
-def get_token(client_id, client_secret, token_url):
-    return wiz_api_client.init(client_id, client_secret, token_url)
+class _BlockSizeAdapter(HTTPAdapter):
+    """HTTPAdapter whose connections stream file bodies in HTTP_UPLOAD_BLOCKSIZE chunks."""
 
+    def init_poolmanager(self, *args, **pool_kwargs):
+        if HTTP_POOL_SUPPORTS_BLOCKSIZE:
+            pool_kwargs.setdefault('blocksize', HTTP_UPLOAD_BLOCKSIZE)
+        super().init_poolmanager(*args, **pool_kwargs)
 
-def validate_json_structure_and_return_value(json_file, struct_list):
-    return_values = []
-    for struct in struct_list:
-        json_tree_var = json_file
-        for element in struct:
-            json_tree_var = json_tree_var[element]
-        return_values.append(json_tree_var)
-    return return_values
 
+def create_session():
+    """
+    Create a pooled requests session with retries, mounted for http and https.
+
+    Connections are kept alive per host, so the token request, every
+    GraphQL call (including System Activity polls) and the S3 PUT each pay
+    the TLS handshake once per run. HTTP/2 would not multiplex further:
+    the auth, API and S3 endpoints are different hosts, and polls are
+    sequential.
+
+    File bodies are sent in HTTP_UPLOAD_BLOCKSIZE chunks, so a large S3 PUT
+    makes ~128x fewer read/send round trips through Python than with the
+    8 KiB http.client default. With urllib3 1.x the pool cannot be told the
+    block size, and uploads keep the default.
+    """
+    session = requests.Session()
+    adapter = _BlockSizeAdapter(pool_connections=HTTP_POOL_CONNECTIONS,
+                                pool_maxsize=HTTP_POOL_MAXSIZE,
+                                max_retries=HTTP_RETRY)
+    session.mount('https://', adapter)
+    session.mount('http://', adapter)
+    return session
 
-def get_cloud_resource():
-    logging.info('# Step 1 - Fetch Cloud Resources')
-    cloud_resource_variables = wiz_api_client.CLOUD_RESOURCE_SEARCH_VARIABLES
-    cloud_resource_result = wiz_api_client.query(
-        wiz_api_client.CLOUD_RESOURCE_SEARCH_QUERY,
-        cloud_resource_variables
-    )
-    logging.info('# Step 1 - Successfully Fetched Cloud Resources')
-    return cloud_resource_result
 
+def token_cache_enabled():
+    """True if WIZ_TOKEN_CACHE is set to 1, true or yes (any case)."""
+    return os.environ.get('WIZ_TOKEN_CACHE', '').strip().lower() in TOKEN_CACHE_ENABLED_VALUES
+
+
+def get_token(client_id, client_secret, token_url, session, use_cached=True):
+    use_cache = token_cache_enabled()
+    if use_cache and use_cached:
+        token = load_cached_token(client_id, token_url)
+        if token:
+            logging.info('Using cached Wiz access token')
+            return token
+
+    token = wiz_api_client.init(client_id, client_secret, token_url, session)
+    if use_cache and wiz_api_client.token_expires_in:
+        save_cached_token(client_id, token_url, token, time.time() + wiz_api_client.token_expires_in)
+    return token
 
-def create_new_file_path_containing_wiz_assets_information(wiz_inventory_content, file_path):
+
+def refresh_token(client_id, client_secret, token_url, session):
+    """Drop the rejected (e.g. revoked) token from the cache and authenticate again."""
+    logging.warning('Wiz API rejected the access token; re-authenticating')
+    clear_cached_token()
+    token = get_token(client_id, client_secret, token_url, session, use_cached=False)
+    session.headers['Authorization'] = 'Bearer ' + token
+
+
+def load_cached_token(client_id, token_url):
+    """Return the cached token for these credentials if it is valid for at least TOKEN_CACHE_MIN_TTL seconds."""
+    try:
+        with open(TOKEN_CACHE_PATH, 'r') as cache_file:
+            cached = json.load(cache_file)
+    except (OSError, ValueError):
+        return None
+    if cached.get('client_id') != client_id or cached.get('token_url') != token_url:
+        return None
+    if cached.get('expires_at', 0) - time.time() <= TOKEN_CACHE_MIN_TTL:
+        return None
+    return cached.get('access_token')
+
+
+def clear_cached_token():
+    """Remove the token cache file, if any."""
+    try:
+        os.remove(TOKEN_CACHE_PATH)
+    except FileNotFoundError:
+        pass
+    except OSError as e:
+        logging.warning(f'Could not remove cached Wiz access token: {e}')
+
+
+def save_cached_token(client_id, token_url, access_token, expires_at):
+    """Persist the token readable by the current user only; a failed write is not fatal."""
+    try:
+        os.makedirs(os.path.dirname(TOKEN_CACHE_PATH), mode=0o700, exist_ok=True)
+        tmp_path = f'{TOKEN_CACHE_PATH}.{os.getpid()}.tmp'
+        fd = os.open(tmp_path, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o600)
+        with os.fdopen(fd, 'w') as cache_file:
+            json.dump({'client_id': client_id, 'token_url': token_url,
+                       'access_token': access_token, 'expires_at': expires_at}, cache_file)
+        os.replace(tmp_path, TOKEN_CACHE_PATH)
+    except OSError as e:
+        logging.warning(f'Could not cache Wiz access token: {e}')
+
+
+def iter_cloud_resources():
+    """
+    Yield cloud resource nodes page by page, following the pageInfo cursor.
+
+    Not part of the upload flow: enrichment (step 2) does not use the
+    inventory yet. Fetching it for nothing cost one query per 500 resources.
+    """
+    cloud_resource_variables = {
+        "first": CLOUD_RESOURCE_PAGE_SIZE,
+        "filterBy": {"type": ENTITY_TYPE}
+    }
+    while True:
+        cloud_resource_result = wiz_api_client.query(
+            wiz_api_client.CLOUD_RESOURCE_SEARCH_QUERY,
+            cloud_resource_variables
+        )
+        cloud_resources = cloud_resource_result["cloudResources"]
+        yield from cloud_resources["nodes"]
+
+        page_info = cloud_resources["pageInfo"]
+        if not page_info["hasNextPage"]:
+            break
+        cloud_resource_variables["after"] = page_info["endCursor"]
+
+
+def create_new_file_path_containing_wiz_assets_information(file_path):
     logging.info('# Step 2 - Enrich Cloud Resources')
     new_file_path = file_path
     logging.info('# Step 2 - Successfully Enriched Cloud Resources')
@@ -236,32 +406,55 @@ def create_new_file_path_containing_wiz_assets_information(wiz_inventory_content
 
 def upload_file_request(wiz_info_file_path):
     logging.info(f'# Step 3 - Upload File Request for {wiz_info_file_path}')
-    upload_request_variables = wiz_api_client.REQUEST_SECURITY_SCAN_UPLOAD_VARIABLE
-    upload_request_variables["filename"] = os.path.split(wiz_info_file_path)[-1]
+    # Built per call: uploads may run concurrently
+    upload_request_variables = {"filename": os.path.basename(wiz_info_file_path)}
 
     upload_response = wiz_api_client.query(
         wiz_api_client.REQUEST_SECURITY_SCAN_UPLOAD_QUERY,
         upload_request_variables
     )
 
-    upload_id, upload_url, system_activity_id = validate_json_structure_and_return_value(
-        upload_response,
-        [["requestSecurityScanUpload", "upload", "id"],
-         ["requestSecurityScanUpload", "upload", "url"],
-         ["requestSecurityScanUpload", "upload", "systemActivityId"]]
-    )
+    upload = upload_response["requestSecurityScanUpload"]["upload"]
+    upload_url, system_activity_id = upload["url"], upload["systemActivityId"]
 
     logging.info('# Step 3 - Upload File Request successful')
     return upload_url, system_activity_id
 
 
-def upload_file_to_s3(url, file_path):
-    logging.info(f'# Step 4 - Upload {file_path} to S3')
+def file_sha256(file_path):
+    """Hex SHA-256 of a file, read in HTTP_UPLOAD_BLOCKSIZE chunks."""
+    with open(file_path, 'rb') as f:
+        if hasattr(hashlib, 'file_digest'):  # Python 3.11+
+            return hashlib.file_digest(f, 'sha256').hexdigest()
+        digest = hashlib.sha256()
+        for chunk in iter(functools.partial(f.read, HTTP_UPLOAD_BLOCKSIZE), b''):
+            digest.update(chunk)
+        return digest.hexdigest()
 
-    with open(file_path) as object_file:
-        object_text = object_file.read()
 
-    response = requests.put(url, data=object_text)
+def upload_file_to_s3(url, file_path, session):
+    logging.info(f'# Step 4 - Upload {file_path} to S3')
+
+    # Stream the file from disk instead of buffering it in memory; an explicit
+    # Content-Length keeps this a plain (non-chunked) PUT, which S3 requires.
+    # The presigned URL carries its own auth, so drop the session's Wiz headers.
+    headers = {
+        'Authorization': None,
+        'Content-Type': None,
+        'Content-Length': str(os.path.getsize(file_path))
+    }
+    # Opt-in: let S3 reject a corrupted body. Headers go out before the body,
+    # so the digest takes a pass over the file first. Presigned URLs that do
+    # not sign this header may refuse it, hence it is off by default.
+    if os.environ.get('WIZ_UPLOAD_CONTENT_SHA256'):
+        headers['x-amz-content-sha256'] = file_sha256(file_path)
+    with open(file_path, 'rb') as object_file:
+        response = session.put(
+            url,
+            data=object_file,
+            headers=headers,
+            timeout=HTTP_TIMEOUT
+        )
     if response.status_code != 200:
         raise Exception(f'Error uploading {file_path}: {response.status_code} - {response.text}')
 
@@ -271,10 +464,13 @@ def upload_file_to_s3(url, file_path):
 def get_system_activity_status(system_activity_id):
     logging.info('# Step 5 - Checking System Activity')
 
-    system_activity_variables = wiz_api_client.SYSTEM_ACTIVITY_VARIABLES
-    system_activity_variables["id"] = system_activity_id
+    # Built per call: uploads may run concurrently
+    system_activity_variables = {"id": system_activity_id}
 
     status = None
+    last_state = object()  # never equal to a polled state, so the first poll is logged
+    attempt = 0
+    deadline = time.monotonic() + POLL_TIMEOUT
 
     while status not in ("SUCCESS", "FAILURE", "SKIPPED"):
         result = wiz_api_client.query(
@@ -286,19 +482,33 @@ def get_system_activity_status(system_activity_id):
 
         #print(f'result: {result}')
 
-        # Activity not ready yet
-        if activity is None:
-            logging.info("System Activity not ready yet... retrying in 3 seconds")
-            time.sleep(3)
-            continue
-
-        status = activity.get("status")
-
-        logging.info(f"Current status: {status}")
-
-        # Not finished yet
-        if status not in ("SUCCESS", "FAILURE", "SKIPPED"):
-            time.sleep(3)
+        # Log only when the activity moves on; unchanged polls stay quiet
+        state = (activity.get("status"), activity.get("statusInfo")) if activity is not None else None
+        changed = state != last_state
+        if changed:
+            last_state = state
+            attempt = 0
+
+        if activity is not None:
+            status = activity.get("status")
+            if changed:
+                status_info = activity.get("statusInfo")
+                logging.info(f"Current status: {status}" + (f" ({status_info})" if status_info else ""))
+            if status in ("SUCCESS", "FAILURE", "SKIPPED"):
+                break
+
+        # Back off from the last change: poll quickly at first, then less often
+        delay = min(POLL_MAX_DELAY, POLL_BASE_DELAY * 2 ** attempt) + random.uniform(0, POLL_BASE_DELAY)
+        attempt += 1
+
+        if time.monotonic() + delay > deadline:
+            raise Exception(f'System Activity {system_activity_id} did not finish within {POLL_TIMEOUT} seconds '
+                            f'(last status: {status})')
+
+        # Activity not ready yet, or not finished yet
+        if activity is None and changed:
+            logging.info("System Activity not ready yet... waiting")
+        time.sleep(delay)
 
     logging.info(f'# Step 5 complete: {status}')
     if status != "SUCCESS":
@@ -310,6 +520,65 @@ def get_system_activity_status(system_activity_id):
 
 
 
+def upload_one(file_path, session):
+    """
+    Run steps 2-5 for one scan file: enrich, request upload, PUT to S3, wait for ingestion.
+
+    Each step depends on the previous one, so they run in order; the pooled
+    session is passed in, so several files can be uploaded concurrently
+    from worker threads.
+    """
+    # Step 2
+    wiz_info_file_path = create_new_file_path_containing_wiz_assets_information(file_path)
+
+    # Step 3
+    upload_url, system_activity_id = upload_file_request(wiz_info_file_path)
+
+    # Step 4
+    upload_file_to_s3(upload_url, wiz_info_file_path, session)
+
+    # Step 5
+    return get_system_activity_status(system_activity_id)
+
+
+def resolve_file_paths(file_path):
+    """
+    Expand --file_path into the scan files to upload.
+
+    Accepts a single file, a directory (its *.json files) or a glob pattern
+    (``**`` matches recursively).
+    """
+    if os.path.isfile(file_path):
+        return [file_path]
+    if os.path.isdir(file_path):
+        pattern = os.path.join(file_path, '*.json')
+    else:
+        pattern = file_path
+    return sorted(path for path in glob.glob(pattern, recursive=True) if os.path.isfile(path))
+
+
+def upload_many(file_paths, session):
+    """
+    Upload several scan files concurrently over the shared session.
+
+    Returns a dict of file path -> System Activity status, or the exception
+    raised for that file; one failing file does not stop the others.
+    """
+    results = {}
+    with ThreadPoolExecutor(max_workers=min(UPLOAD_CONCURRENCY, len(file_paths))) as executor:
+        futures = {
+            path: executor.submit(upload_one, path, session)
+            for path in file_paths
+        }
+        for path, future in futures.items():
+            try:
+                results[path] = future.result()
+            except Exception as e:
+                logging.error(f'Upload of {path} failed: {e}')
+                results[path] = e
+    return results
+
+
 def load_config_from_env():
     """
     Load Wiz credentials from environment variables.
@@ -350,7 +619,8 @@ def main():
     try:
         parser = argparse.ArgumentParser(description='Upload security files to Wiz')
         parser.add_argument('-c', '--config_file', type=str, help='Path to config JSON')
-        parser.add_argument('-f', '--file_path', type=str, help='Path to enrichment JSON')
+        parser.add_argument('-f', '--file_path', type=str,
+                            help='Path to enrichment JSON, or a directory / glob of them to upload in one run')
         args = parser.parse_args()
 
         # ---------------------------------------
@@ -366,7 +636,8 @@ def main():
             if not os.path.isfile(args.config_file):
                 raise Exception(f'Config file "{args.config_file}" not found.')
 
-            if not os.path.isfile(args.file_path):
+            file_paths = resolve_file_paths(args.file_path)
+            if not file_paths:
                 raise Exception(f'File path "{args.file_path}" not found.')
 
             config = load_config(args.config_file)
@@ -376,10 +647,8 @@ def main():
             client_secret = env_config.get("CLIENT_SECRET", config.get("CLIENT_SECRET", CLIENT_SECRET))
             token_url = env_config.get("TOKEN_URL", config.get("TOKEN_URL", TOKEN_URL))
             api_endpoint = env_config.get("API_ENDPOINT_URL", config.get("API_ENDPOINT_URL", API_ENDPOINT_URL))
+            wiz_api_client.compress_requests = bool(config.get("COMPRESS_REQUESTS", False))
 
-            file_path = args.file_path
-
-            token = get_token(client_id, client_secret, token_url)
 
         else:
             # ---------------------------------------
@@ -390,40 +659,43 @@ def main():
             token_url = env_config.get("TOKEN_URL", TOKEN_URL)
             api_endpoint = env_config.get("API_ENDPOINT_URL", API_ENDPOINT_URL)
             
-            token = get_token(client_id, client_secret, token_url)
-            file_path = FILE_ABSOLUTE_PATH
+            file_paths = resolve_file_paths(FILE_ABSOLUTE_PATH)
+            if not file_paths:
+                raise Exception(f'File path "{FILE_ABSOLUTE_PATH}" not found.')
 
         # ---------------------------------------
         # AUTH & EXECUTION
         # ---------------------------------------
-        with requests.Session() as session:
+        # One pooled session for the token request, every API call and the S3 upload
+        with create_session() as session:
+            wiz_api_client.session = session
+            token = get_token(client_id, client_secret, token_url, session)
+            wiz_api_client.reauthenticate = functools.partial(
+                refresh_token, client_id, client_secret, token_url, session)
+
             session.headers.update({
                 'Content-Type': 'application/json',
+                'Accept-Encoding': 'gzip, deflate',
                 'Authorization': 'Bearer ' + token
             })
-            wiz_api_client.session = session
             wiz_api_client.api_endpoint_url = api_endpoint
 
-            # Step 1
-            wiz_inventory_content = get_cloud_resource()
-
-            # Step 2
-            wiz_info_file_path = create_new_file_path_containing_wiz_assets_information(
-                wiz_inventory_content, file_path)
-
-            # Step 3
-            upload_url, system_activity_id = upload_file_request(wiz_info_file_path)
-
-            # Step 4
-            upload_file_to_s3(upload_url, wiz_info_file_path)
-
-            # Step 5
-            get_system_activity_status(system_activity_id)
+            # Steps 2-5; there is no step 1 (the cloud resource inventory
+            # was fetched here but never used)
+            if len(file_paths) == 1:
+                upload_one(file_paths[0], session)
+            else:
+                # Authenticated once; fan the files out over the pooled session
+                results = upload_many(file_paths, session)
+                failed = [path for path, result in results.items() if isinstance(result, Exception)]
+                if failed:
+                    raise Exception(f'{len(failed)} of {len(file_paths)} uploads failed: {", ".join(failed)}')
 
         logging.info('Script completed successfully')
         exit(0)
 
     except Exception as e:
+        import traceback
         print(f'An unexpected error occurred.\nDetails: {str(e)}')
         print(traceback.format_exc())
         exit(1)
@@ -19,7 +19,22 @@ import sys
 import time
 from datetime import datetime, timezone
 from pathlib import Path
-from typing import Any, Dict, Optional, Tuple
+from typing import Any, Dict, List, Optional, Tuple
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+try:
+    import ijson
+except ImportError:
+    ijson = None
+
+from schema_validation import get_validator
+
+# Parse errors raised while reading Wiz JSON
+_JSON_ERRORS = (json.JSONDecodeError,) + ((ijson.JSONError,) if ijson else ())
 
 # Note: In production, use environment variables for credentials
 # For now, this is a template for future API integration
@@ -31,6 +46,81 @@ logging.basicConfig(
 logger = logging.getLogger(__name__)
 
 
+def _load_json(file_path: Path) -> Any:
+    """Parse a JSON file, with orjson when available."""
+    with open(file_path, 'rb') as f:
+        data = f.read()
+    return orjson.loads(data) if orjson else json.loads(data)
+
+
+def _dumps(obj: Any) -> bytes:
+    """Serialize a document to compact JSON bytes, with orjson when available."""
+    if orjson:
+        return orjson.dumps(obj)
+    return json.dumps(obj, separators=(',', ':')).encode('utf-8')
+
+
+def summarize_wiz_file(file_path: Path) -> Dict[str, Any]:
+    """
+    Count the data sources, assets and findings in a Wiz JSON file.
+    
+    With ijson installed the file is streamed, so memory stays constant
+    however large the document is; otherwise it is loaded in full.
+    
+    Returns:
+        Dict with integrationId and dataSources/assets/vulnerabilityFindings counts
+    """
+    if ijson is None:
+        return summarize_wiz_doc(_load_json(file_path))
+
+    summary = {"integrationId": None, "dataSources": 0, "assets": 0, "vulnerabilityFindings": 0}
+    with open(file_path, 'rb') as f:
+        for prefix, event, value in ijson.parse(f):
+            if event == "start_map":
+                if prefix == "dataSources.item":
+                    summary["dataSources"] += 1
+                elif prefix == "dataSources.item.assets.item":
+                    summary["assets"] += 1
+                elif prefix == "dataSources.item.assets.item.vulnerabilityFindings.item":
+                    summary["vulnerabilityFindings"] += 1
+            elif prefix == "integrationId" and event == "string":
+                summary["integrationId"] = value
+    return summary
+
+
+def summarize_wiz_doc(doc: Dict[str, Any]) -> Dict[str, Any]:
+    """Count the data sources, assets and findings in an already-parsed Wiz document."""
+    summary = {"integrationId": doc.get("integrationId"), "dataSources": 0, "assets": 0, "vulnerabilityFindings": 0}
+    for data_source in doc.get("dataSources", []):
+        summary["dataSources"] += 1
+        for asset in data_source.get("assets", []):
+            summary["assets"] += 1
+            summary["vulnerabilityFindings"] += len(asset.get("vulnerabilityFindings", []))
+    return summary
+
+
+def load_and_validate(
+    file_path: Path, schema_path: Path, all_errors: bool = False
+) -> Tuple[Any, List[Any]]:
+    """
+    Parse a Wiz JSON file once and validate it against a schema.
+    
+    The parsed document is returned so callers (e.g. an upload following
+    validation) can reuse it instead of reading the file again.
+    
+    Args:
+        file_path: Path to Wiz JSON file
+        schema_path: Path to schema file
+        all_errors: Collect every validation error instead of stopping at the first
+        
+    Returns:
+        Tuple of (document, list of jsonschema ValidationErrors; empty if valid)
+    """
+    doc = _load_json(file_path)
+    # Validators are stateless; reuse one per schema across files
+    return doc, get_validator(schema_path).errors(doc, all_errors=all_errors)
+
+
 class WizAPIClient:
     """Client for Wiz API integration."""
 
@@ -78,39 +168,48 @@ class WizAPIClient:
 
     def upload_file(
         self,
-        file_path: Path,
+        file_path: Optional[Path],
         integration_id: str,
-        metadata: Optional[Dict[str, Any]] = None
+        metadata: Optional[Dict[str, Any]] = None,
+        payload: Optional[Dict[str, Any]] = None
     ) -> Tuple[bool, Optional[str]]:
         """
         Upload vulnerability findings file to Wiz.
         
         Args:
-            file_path: Path to the converted Wiz JSON file
+            file_path: Path to the converted Wiz JSON file (may be None when
+                payload is given)
             integration_id: Integration ID from the JSON file
             metadata: Optional metadata about the upload
+            payload: The file's already-parsed document (e.g. from
+                load_and_validate), to avoid reading the file again
             
         Returns:
             Tuple of (success: bool, upload_id: Optional[str])
         """
-        if not file_path.exists():
+        if payload is None and (file_path is None or not file_path.exists()):
             logger.error(f"File not found: {file_path}")
             return False, None
 
         try:
-            # Load and validate the JSON
-            with open(file_path, 'r') as f:
-                payload = json.load(f)
-
-            logger.info(f"Loaded file: {file_path}")
-            logger.info(f"Integration ID: {payload.get('integrationId')}")
-            logger.info(f"Data sources: {len(payload.get('dataSources', []))}")
-
-            # Future: Actual API call
+            # Only counts are needed here; stream them rather than load the document
+            if payload is not None:
+                summary = summarize_wiz_doc(payload)
+            else:
+                summary = summarize_wiz_file(file_path)
+
+            logger.info(f"Loaded file: {file_path or '(in-memory payload)'}")
+            logger.info(f"Integration ID: {summary['integrationId']}")
+            logger.info(f"Data sources: {summary['dataSources']}")
+            logger.info(f"Assets: {summary['assets']}, findings: {summary['vulnerabilityFindings']}")
+
+            # Future: Actual API call; an unparsed file is sent as-is and a
+            # parsed payload is serialized once
+            # body = _dumps(payload) if payload is not None else file_path.read_bytes()
             # response = self._make_request(
             #     method="POST",
             #     endpoint="/ingestion/vulnerability-findings",
-            #     json=payload
+            #     data=body
             # )
             # 
             # if response.status_code == 200:
@@ -122,9 +221,9 @@ class WizAPIClient:
             #     return False, None
 
             logger.info("API integration ready (awaiting credentials)")
-            return True, payload.get('integrationId')
+            return True, summary['integrationId']
 
-        except json.JSONDecodeError as e:
+        except _JSON_ERRORS as e:
             logger.error(f"Invalid JSON in file: {e}")
             return False, None
         except Exception as e:
@@ -177,46 +276,40 @@ class WizAPIClient:
         return headers
 
 
-def validate_before_upload(file_path: Path, schema_path: Path) -> bool:
+def validate_before_upload(
+    file_path: Path, schema_path: Path, verbose: bool = False
+) -> Tuple[bool, Optional[Any]]:
     """
     Validate the Wiz JSON file before uploading.
     
     Args:
         file_path: Path to Wiz JSON file
         schema_path: Path to schema file
+        verbose: Count all validation errors instead of reporting only the first
         
     Returns:
-        True if valid, False otherwise
+        Tuple of (valid, parsed document). The document is returned for
+        reuse by the upload and is None if validation failed.
     """
     try:
-        import jsonschema
-        from jsonschema import Draft4Validator
-
-        with open(file_path, 'r') as f:
-            doc = json.load(f)
-
-        with open(schema_path, 'r') as f:
-            schema = json.load(f)
-
-        validator = Draft4Validator(schema)
-        errors = list(validator.iter_errors(doc))
+        doc, errors = load_and_validate(file_path, schema_path, all_errors=verbose)
 
         if errors:
-            logger.error(f"✗ Validation failed with {len(errors)} error(s):")
-            for err in errors[:3]:  # Show first 3 errors
+            if verbose:
+                logger.error(f"✗ Validation failed with {len(errors)} error(s):")
+            else:
+                logger.error("✗ Validation failed (use --verbose to list all errors):")
+            for err in errors:
                 logger.error(f"  - {err.message}")
                 logger.error(f"    Path: {' -> '.join(str(p) for p in err.path)}")
-            return False
+            return False, None
 
         logger.info("✓ JSON valid against local schema")
-        return True
+        return True, doc
 
-    except ImportError:
-        logger.warning("jsonschema library not available, skipping validation")
-        return True
     except Exception as e:
         logger.error(f"Validation error: {e}")
-        return False
+        return False, None
 
 
 def main():
@@ -252,11 +345,17 @@ def main():
         "--api-token",
         help="API token (or use WIZ_API_TOKEN env var)"
     )
+    parser.add_argument(
+        "--verbose",
+        action="store_true",
+        help="Report the full list of validation errors"
+    )
 
     args = parser.parse_args()
 
-    # Validate first
-    if not validate_before_upload(args.file, args.schema):
+    # Validate first; the parsed document is handed to the upload as-is
+    valid, doc = validate_before_upload(args.file, args.schema, verbose=args.verbose)
+    if not valid:
         logger.error("Validation failed, aborting upload")
         return 1
 
@@ -265,6 +364,12 @@ def main():
         return 0
 
     # Upload
+    client = WizAPIClient(api_url=args.api_url, api_token=args.api_token)
+    if client.api_token and client.authenticate():
+        integration_id = doc.get("integrationId", "") if doc else ""
+        success, _upload_id = client.upload_file(args.file, integration_id, payload=doc)
+        return 0 if success else 1
+
     logger.info("\nWiz API Integration - Ready for upload")
     logger.info("Set credentials to enable uploads:")
     logger.info("  - WIZ_API_TOKEN environment variable, or")